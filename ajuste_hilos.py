@@ -0,0 +1,240 @@
+"""
+Ajuste del reparto de hilos y núcleos por equipo.
+
+OpenCV y el runtime de MediaPipe eligen por su cuenta cuántos hilos usar, y en
+equipos con pocos núcleos compiten entre sí y con el dibujado de la interfaz.
+Este módulo guarda por equipo un perfil con:
+
+    - `cv2_hilos`: valor para `cv2.setNumThreads` (-1 deja el de OpenCV).
+    - `delegado`: delegado del landmarker ('CPU' o 'GPU').
+    - `afinidad`: núcleos de cada etapa ('captura', 'inferencia', 'interfaz'),
+      o None para no restringirlos. Solo se aplica donde existe
+      `os.sched_setaffinity` (Linux) y tiene efecto en el modo multiproceso,
+      donde cada etapa es un proceso.
+
+`aplicar_perfil` se llama al arrancar la aplicación y cada proceso de trabajo.
+Ejecutado como script, barre las combinaciones sobre un vídeo grabado, mide los
+fotogramas por segundo de cada una (mediana de varias medidas, sin contar la
+carga del modelo) y guarda la mejor en `config.ruta_perfil_hilos`.
+
+Uso:
+    python ajuste_hilos.py VIDEO [--segundos N] [--repeticiones N] [--afinidad] [--salida RUTA]
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+
+import cv2
+
+from config import config
+
+
+def cargar_perfil(ruta=None):
+    """
+    Lee el perfil de hilos del equipo.
+
+    Args:
+        ruta (str): Archivo del perfil, o None para `config.ruta_perfil_hilos`.
+
+    Returns:
+        dict: Perfil guardado, o None si no existe o no se puede leer.
+    """
+    ruta = ruta or config.ruta_perfil_hilos
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Aviso: perfil de hilos {ruta} ignorado ({e})")
+        return None
+
+
+def guardar_perfil(perfil, ruta=None):
+    """Escribe el perfil de forma atómica (archivo temporal y renombrado)."""
+    ruta = ruta or config.ruta_perfil_hilos
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(perfil, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def aplicar_perfil(perfil, etapa=None):
+    """
+    Aplica el número de hilos de OpenCV y, si se indica la etapa, su afinidad.
+
+    Args:
+        perfil (dict): Perfil de hilos, o None para no cambiar nada.
+        etapa (str): 'captura', 'inferencia' o 'interfaz'; None para no tocar
+            la afinidad (modo de un solo proceso).
+    """
+    if not perfil:
+        return
+    if perfil.get("cv2_hilos") is not None:
+        cv2.setNumThreads(perfil["cv2_hilos"])
+
+    afinidad = perfil.get("afinidad")
+    if etapa and afinidad and afinidad.get(etapa) and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, afinidad[etapa])
+        except OSError as e:
+            # El perfil puede venir de otro equipo con menos núcleos
+            print(f"Aviso: afinidad de {etapa} no aplicada ({e})")
+
+
+def delegado(perfil):
+    """
+    Returns:
+        mediapipe.tasks.BaseOptions.Delegate: Delegado del landmarker según el perfil.
+    """
+    import mediapipe as mp
+
+    if perfil and perfil.get("delegado") == "GPU":
+        return mp.tasks.BaseOptions.Delegate.GPU
+    return mp.tasks.BaseOptions.Delegate.CPU
+
+
+def nucleos_disponibles():
+    """Núcleos en los que puede ejecutarse el proceso."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def candidatos_hilos(n_nucleos):
+    """Valores de `cv2.setNumThreads` a probar (-1 es el valor por defecto de OpenCV)."""
+    return sorted({-1, 1, 2, max(1, n_nucleos // 2), n_nucleos})
+
+
+def disposiciones_afinidad(nucleos):
+    """
+    Repartos de núcleos entre etapas a probar.
+
+    Returns:
+        list: Tuplas (nombre, afinidad) con afinidad None para el reparto libre.
+    """
+    disposiciones = [("libre", None)]
+    if len(nucleos) >= 3:
+        # La captura y la interfaz comparten un núcleo; la inferencia se queda el resto
+        disposiciones.append(("inferencia_aislada", {"captura": nucleos[:1], "interfaz": nucleos[:1],
+                                                     "inferencia": nucleos[1:]}))
+    if len(nucleos) >= 4:
+        disposiciones.append(("etapas_aisladas", {"captura": nucleos[:1], "interfaz": nucleos[1:2],
+                                                  "inferencia": nucleos[2:]}))
+    return disposiciones
+
+
+def medir_mediana(medir, repeticiones, *args, **kwargs):
+    """
+    Repite una medida y se queda con la de FPS medianos.
+
+    Las medidas ya excluyen la carga del modelo y una primera inferencia de
+    calentamiento; la mediana descarta además las repeticiones perturbadas por
+    otros procesos del equipo.
+
+    Args:
+        medir (callable): `medir_un_proceso` o `medir_multiproceso`.
+        repeticiones (int): Número de medidas.
+
+    Returns:
+        dict: Resultado de la repetición mediana, con los FPS de todas en 'fps_repeticiones'.
+    """
+    resultados = sorted((medir(*args, **kwargs) for _ in range(repeticiones)), key=lambda r: r["fps"])
+    mediana = dict(resultados[len(resultados) // 2])
+    mediana["fps_repeticiones"] = [r["fps"] for r in resultados]
+    return mediana
+
+
+def ajustar(video, segundos, probar_afinidad=False, perfil_render=None, repeticiones=3):
+    """
+    Barre las combinaciones sobre un vídeo y devuelve el mejor perfil.
+
+    Primero se prueban `cv2_hilos` y el delegado con el bucle de un solo proceso;
+    después, con la mejor combinación, los repartos de núcleos con el modo
+    multiproceso. Cada combinación se mide `repeticiones` veces y se compara por
+    la mediana.
+
+    Args:
+        video (str): Archivo de vídeo grabado.
+        segundos (float): Duración de cada medida.
+        probar_afinidad (bool): Probar también los repartos de núcleos.
+        perfil_render (str): Perfil de renderizado de la interfaz.
+        repeticiones (int): Medidas por combinación (al menos 3).
+
+    Returns:
+        dict: Perfil con la mejor combinación y todas las mediciones.
+    """
+    from bench_multiproceso import medir_un_proceso, medir_multiproceso
+    from interfaz import Interfaz
+
+    repeticiones = max(3, repeticiones)
+    # Sin límite de FPS para medir el rendimiento máximo
+    config.fps_objetivo["JUGANDO"] = None
+    interfaz = Interfaz(perfil_render)
+    nucleos = nucleos_disponibles()
+    mediciones = []
+
+    mejor = None
+    for delegado_nombre in ("CPU", "GPU"):
+        for hilos in candidatos_hilos(len(nucleos)):
+            candidato = {"cv2_hilos": hilos, "delegado": delegado_nombre, "afinidad": None}
+            try:
+                resultado = medir_mediana(medir_un_proceso, repeticiones, video, interfaz, segundos,
+                                          perfil=candidato)
+            except Exception as e:
+                # El delegado GPU no está disponible en todas las plataformas
+                print(f"{delegado_nombre} cv2_hilos={hilos}: no disponible ({e})")
+                break
+            print(f"{delegado_nombre} cv2_hilos={hilos}: {resultado['fps']:.1f} FPS "
+                  f"({', '.join(f'{fps:.1f}' for fps in resultado['fps_repeticiones'])})")
+            mediciones.append({"modo": "un_proceso", **candidato, **resultado})
+            if mejor is None or resultado["fps"] > mejor[1]:
+                mejor = (candidato, resultado["fps"])
+
+    if mejor is None:
+        raise RuntimeError("Ninguna combinación ha podido medirse")
+    perfil = dict(mejor[0])
+    if probar_afinidad and hasattr(os, "sched_setaffinity"):
+        original = os.sched_getaffinity(0)
+        mejor_afinidad = None
+        for nombre, afinidad in disposiciones_afinidad(nucleos):
+            candidato = {**perfil, "afinidad": afinidad}
+            resultado = medir_mediana(medir_multiproceso, repeticiones, video, interfaz, segundos,
+                                      perfil=candidato)
+            os.sched_setaffinity(0, original)
+            print(f"multiproceso {nombre}: {resultado['fps']:.1f} FPS "
+                  f"({', '.join(f'{fps:.1f}' for fps in resultado['fps_repeticiones'])})")
+            mediciones.append({"modo": "multiproceso", "disposicion": nombre, **candidato, **resultado})
+            if mejor_afinidad is None or resultado["fps"] > mejor_afinidad[1]:
+                mejor_afinidad = (afinidad, resultado["fps"])
+        perfil["afinidad"] = mejor_afinidad[0]
+
+    perfil["equipo"] = {"nombre": platform.node(), "procesador": platform.processor(),
+                        "nucleos": len(nucleos), "sistema": platform.platform()}
+    perfil["fecha"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    perfil["mediciones"] = mediciones
+    return perfil
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ajuste de hilos de OpenCV y MediaPipe para este equipo")
+    parser.add_argument("video", help="Archivo de vídeo de prueba")
+    parser.add_argument("--segundos", type=float, default=10, help="Duración de cada medida")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="Medidas por combinación; se compara la mediana (mínimo 3)")
+    parser.add_argument("--afinidad", action="store_true",
+                        help="Probar también repartos de núcleos entre etapas (modo multiproceso)")
+    parser.add_argument("--perfil", choices=sorted(config.perfiles_render), default=config.perfil_render,
+                        help="Perfil de renderizado")
+    parser.add_argument("--salida", default=config.ruta_perfil_hilos, help="Archivo del perfil")
+    args = parser.parse_args()
+
+    perfil = ajustar(args.video, args.segundos, args.afinidad, args.perfil, args.repeticiones)
+    guardar_perfil(perfil, args.salida)
+    print(f"Mejor configuración: cv2_hilos={perfil['cv2_hilos']}, delegado={perfil['delegado']}, "
+          f"afinidad={perfil['afinidad']}")
+    print(f"Perfil guardado en {args.salida}")
@@ -0,0 +1,130 @@
+"""
+Comparativa del bucle de un solo proceso frente al modo multiproceso.
+
+Reproduce un archivo de vídeo durante el mismo tiempo con ambos modos, sin
+ventana, y muestra los fotogramas compuestos por segundo, las inferencias por
+segundo y la latencia media desde la captura hasta la composición del lienzo.
+
+Uso:
+    python bench_multiproceso.py VIDEO [--segundos N] [--perfil NOMBRE]
+"""
+
+import argparse
+import time
+
+import cv2
+import mediapipe as mp
+
+from config import config
+from ajuste_hilos import aplicar_perfil, delegado
+from camara import camara_desde_config
+from evaluacion import evaluar_postura
+from interfaz import Interfaz
+from motor_sesion import MotorSesion
+from multiproceso import PipelineMultiproceso, bucle_ui
+from posturas import POSTURAS_YOGA, LISTA_POSTURAS
+
+
+def medir_un_proceso(fuente, interfaz, segundos, perfil=None):
+    """
+    Ejecuta el bucle equivalente al de app.py (captura, inferencia y composición
+    en serie) durante `segundos`, sin contar la carga del modelo ni una primera
+    inferencia de calentamiento.
+
+    Args:
+        perfil (dict): Perfil de hilos a aplicar (ver `ajuste_hilos`), o None.
+
+    Returns:
+        dict: Fotogramas por segundo, inferencias por segundo y latencia media (ms).
+    """
+    aplicar_perfil(perfil)
+    options = mp.tasks.vision.PoseLandmarkerOptions(
+        base_options=mp.tasks.BaseOptions(model_asset_path=config.model_path, delegate=delegado(perfil)),
+        running_mode=mp.tasks.vision.RunningMode.VIDEO,
+        num_poses=1
+    )
+    cap = camara_desde_config(config, fuente)
+    cap.abrir()
+    motor = MotorSesion(LISTA_POSTURAS, config.segundos_para_superar)
+    motor.iniciar()
+
+    fotogramas = 0
+    latencia = 0.0
+    timestamp = 0
+    with mp.tasks.vision.PoseLandmarker.create_from_options(options) as landmarker:
+        # La creación del modelo y la primera inferencia no cuentan en la medida,
+        # igual que en el modo multiproceso, que espera al primer resultado
+        ret, frame = cap.read()
+        if ret:
+            rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+            landmarker.detect_for_video(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb), timestamp)
+        origen = time.perf_counter()
+        while time.perf_counter() - origen < segundos:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame = cv2.flip(frame, 1)
+            nombre_postura = motor.postura_actual or LISTA_POSTURAS[0]
+
+            timestamp = max(timestamp + 1, int((time.perf_counter() - origen) * 1000))
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = landmarker.detect_for_video(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb), timestamp)
+            todo_correcto = False
+            if result.pose_landmarks:
+                _, _, todo_correcto = evaluar_postura(result.pose_landmarks[0], POSTURAS_YOGA[nombre_postura])
+            tiempo_mantenido = motor.actualizar(todo_correcto)
+            interfaz.pantalla_juego(frame, nombre_postura, motor.postura_idx, len(LISTA_POSTURAS),
+                                    tiempo_mantenido, config.segundos_para_superar)
+
+            fotogramas += 1
+            latencia += time.perf_counter() - cap.t_captura
+            if motor.estado != "JUGANDO":
+                motor.reiniciar()
+                motor.iniciar()
+    cap.release()
+
+    duracion = time.perf_counter() - origen
+    return {"fps": fotogramas / duracion, "inferencias_s": fotogramas / duracion,
+            "latencia_ms": 1000 * latencia / max(fotogramas, 1)}
+
+
+def medir_multiproceso(fuente, interfaz, segundos, perfil=None):
+    """
+    Ejecuta el modo multiproceso sin ventana durante `segundos`.
+
+    Args:
+        perfil (dict): Perfil de hilos a aplicar a cada etapa, o None.
+
+    Returns:
+        dict: Fotogramas por segundo, inferencias por segundo, latencia media (ms)
+            y fotogramas descartados por sobrescritura.
+    """
+    aplicar_perfil(perfil, "interfaz")
+    with PipelineMultiproceso(fuente, perfil=perfil) as pipeline:
+        # Esperar a que el modelo cargue y publique el primer resultado
+        while pipeline.resultados.ultimo() < 0:
+            pipeline.supervisor.vigilar()
+            time.sleep(0.05)
+
+        motor = MotorSesion(LISTA_POSTURAS, config.segundos_para_superar)
+        motor.iniciar()
+        metricas = bucle_ui(pipeline, interfaz, motor, mostrar=False, duracion=segundos)
+
+    return {"fps": metricas["mostrados"] / segundos, "inferencias_s": metricas["resultados"] / segundos,
+            "latencia_ms": metricas["latencia_fotograma_ms"], "sobrescritos": metricas["sobrescritos"]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Un proceso frente a multiproceso")
+    parser.add_argument("video", help="Archivo de vídeo de prueba")
+    parser.add_argument("--segundos", type=float, default=20)
+    parser.add_argument("--perfil", choices=sorted(config.perfiles_render), default=config.perfil_render)
+    args = parser.parse_args()
+
+    # Sin límite de FPS para medir el rendimiento máximo de cada modo
+    config.fps_objetivo["JUGANDO"] = None
+    interfaz = Interfaz(args.perfil)
+
+    for nombre, medir in (("un proceso", medir_un_proceso), ("multiproceso", medir_multiproceso)):
+        resultado = medir(args.video, interfaz, args.segundos)
+        print(f"{nombre:<14} " + ", ".join(f"{clave}: {valor:.1f}" for clave, valor in resultado.items()))
@@ -0,0 +1,86 @@
+"""
+Comparativa del coste de renderizado por fotograma de cada perfil.
+
+Compone las pantallas de la aplicación con un fotograma de cámara sintético,
+sin cámara, modelo ni ventana, y muestra el tiempo medio y el percentil 95 por
+fotograma para cada perfil de `config.perfiles_render`.
+
+Con `--grabar` se repite la pantalla de juego entregando cada lienzo a un
+`GrabadorSesion`, para comprobar el coste de grabar en el bucle.
+
+Uso:
+    python bench_render.py [--fotogramas N] [--perfil NOMBRE ...] [--grabar]
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from config import config
+from interfaz import Interfaz
+from grabador import GrabadorSesion
+
+
+def medir(funcion, fotogramas):
+    """
+    Ejecuta una función de renderizado y mide su duración.
+
+    Returns:
+        tuple: (media_ms, p95_ms).
+    """
+    tiempos = []
+    for i in range(fotogramas):
+        t0 = time.perf_counter()
+        funcion(i)
+        tiempos.append(time.perf_counter() - t0)
+    tiempos.sort()
+    return 1000 * sum(tiempos) / len(tiempos), 1000 * tiempos[int(len(tiempos) * 0.95)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coste de renderizado por perfil")
+    parser.add_argument("--fotogramas", type=int, default=300)
+    parser.add_argument("--perfil", nargs="*", default=list(config.perfiles_render))
+    parser.add_argument("--grabar", action="store_true", help="Medir también la pantalla de juego grabando")
+    args = parser.parse_args()
+
+    ancho_cam, alto_cam = config.camara_resolucion
+    frame = np.random.default_rng(0).integers(0, 256, (alto_cam, ancho_cam, 3), dtype=np.uint8)
+
+    print(f"{'PERFIL':<18}{'LIENZO':>11}{'PANTALLA':>12}{'MEDIA':>10}{'P95':>10}")
+    for perfil in args.perfil:
+        interfaz = Interfaz(perfil)
+        lienzo_txt = f"{interfaz.W}x{interfaz.H}"
+        pantallas = {
+            # Tiempo 0.5 para que el aviso parpadeante esté visible
+            "inicio": lambda i: interfaz.pantalla_inicio(0.5),
+            "juego": lambda i: interfaz.pantalla_juego(frame, "ARBOL", 6, 13, None, 3),
+            "progreso": lambda i: interfaz.pantalla_juego(frame, "ARBOL", 6, 13, (i % 30) / 10, 3),
+            "final": lambda i: interfaz.pantalla_final(),
+        }
+        for nombre, funcion in pantallas.items():
+            media, p95 = medir(funcion, args.fotogramas)
+            print(f"{perfil:<18}{lienzo_txt:>11}{nombre:>12}{media:>8.2f}ms{p95:>8.2f}ms")
+
+        if args.grabar:
+            with tempfile.TemporaryDirectory() as directorio:
+                grabador = GrabadorSesion(directorio, codec=config.grabacion_codec, fps=config.grabacion_fps,
+                                          resolucion=config.grabacion_resolucion,
+                                          max_pendientes=config.grabacion_max_pendientes)
+
+                tiempos = []
+                for i in range(args.fotogramas):
+                    t0 = time.perf_counter()
+                    lienzo = interfaz.pantalla_juego(frame, "ARBOL", 6, 13, (i % 30) / 10, 3)
+                    grabador.escribir(lienzo, "ARBOL")
+                    tiempos.append(time.perf_counter() - t0)
+                    # Cadencia de 30 FPS para que el diezmado actúe como en la aplicación
+                    time.sleep(max(0, 1 / 30 - tiempos[-1]))
+                grabador.cerrar()
+                tiempos.sort()
+                media = 1000 * sum(tiempos) / len(tiempos)
+                p95 = 1000 * tiempos[int(len(tiempos) * 0.95)]
+                print(f"{perfil:<18}{lienzo_txt:>11}{'grabando':>12}{media:>8.2f}ms{p95:>8.2f}ms  "
+                      f"{grabador.metricas()}")
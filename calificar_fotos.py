@@ -0,0 +1,297 @@
+"""
+Calificación por lotes de fotos de una postura.
+
+Evalúa un directorio de fotos (o una lista de rutas por la entrada estándar)
+frente a una entrada de `POSTURAS_YOGA`, con el modelo en modo IMAGE:
+
+    - Un grupo de hilos decodifica las fotos y ejecuta la detección. Cada hilo
+      toma prestado un landmarker de un pool, de modo que los modelos se crean
+      una sola vez y no se comparten entre hilos a la vez.
+    - Los landmarks se acumulan en lotes y se evalúan con `angulos_lote` y
+      `veredictos_lote`.
+    - Se escribe un CSV con una fila por foto y ángulo y, opcionalmente, una
+      miniatura con las articulaciones coloreadas según el veredicto.
+
+Al terminar se muestra el rendimiento en imágenes por segundo.
+
+Uso:
+    python calificar_fotos.py POSTURA DIRECTORIO [--salida CSV] [--miniaturas DIR]
+        [--hilos N] [--lote N]
+    find fotos_alumnos -name '*.jpg' | python calificar_fotos.py POSTURA -
+"""
+
+import argparse
+import collections
+import contextlib
+import csv
+import hashlib
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from config import config
+from ajuste_hilos import cargar_perfil, delegado
+from angulos import ANGULO_LANDMARKS_MAP
+from evaluacion import COLOR_CORRECTO, COLOR_INCORRECTO, angulos_lote, nombres_angulos, veredictos_lote
+from posturas import POSTURAS_YOGA
+
+EXTENSIONES = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+COLUMNAS = ["imagen", "estado", "postura", "angulo", "valor", "objetivo", "error", "correcto", "todo_correcto"]
+
+
+class PoolLandmarkers:
+    """
+    Conjunto de landmarkers en modo IMAGE que los hilos toman prestados.
+
+    Un landmarker no debe usarse desde dos hilos a la vez; el pool garantiza que
+    cada uno lo usa un único hilo en cada momento.
+    """
+
+    def __init__(self, tamano, perfil=None):
+        """
+        Args:
+            tamano (int): Número de landmarkers (normalmente, uno por hilo).
+            perfil (dict): Perfil de hilos del equipo, para elegir el delegado.
+        """
+        opciones = mp.tasks.vision.PoseLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=config.model_path, delegate=delegado(perfil)),
+            running_mode=mp.tasks.vision.RunningMode.IMAGE,
+            num_poses=1
+        )
+        self._libres = queue.Queue()
+        self._todos = []
+        for _ in range(tamano):
+            landmarker = mp.tasks.vision.PoseLandmarker.create_from_options(opciones)
+            self._todos.append(landmarker)
+            self._libres.put(landmarker)
+
+    @contextlib.contextmanager
+    def prestar(self):
+        """Presta un landmarker libre, esperando si todos están en uso."""
+        landmarker = self._libres.get()
+        try:
+            yield landmarker
+        finally:
+            self._libres.put(landmarker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        for landmarker in self._todos:
+            landmarker.close()
+        self._todos = []
+
+
+def listar_imagenes(entrada):
+    """
+    Rutas de las fotos a calificar.
+
+    Args:
+        entrada (str): Directorio, o '-' para leer una ruta por línea de la
+            entrada estándar (a medida que llegan).
+
+    Yields:
+        str: Ruta de cada foto.
+    """
+    if entrada == "-":
+        for linea in sys.stdin:
+            if linea.strip():
+                yield linea.strip()
+        return
+    for nombre in sorted(os.listdir(entrada)):
+        if nombre.lower().endswith(EXTENSIONES):
+            yield os.path.join(entrada, nombre)
+
+
+def detectar(ruta, pool, ancho_miniatura=None):
+    """
+    Decodifica una foto y detecta la pose (se ejecuta en los hilos del pool).
+
+    Args:
+        ruta (str): Ruta de la foto.
+        pool (PoolLandmarkers): Pool del que tomar un landmarker.
+        ancho_miniatura (int): Ancho de la miniatura a devolver, o None para no
+            conservar la imagen.
+
+    Returns:
+        tuple: (ruta, estado, landmarks, miniatura) con estado 'ok', 'sin_persona'
+            o 'ilegible', landmarks como array (33, 3) o None, y la miniatura BGR
+            o None.
+    """
+    imagen = cv2.imread(ruta)
+    if imagen is None:
+        return ruta, "ilegible", None, None
+
+    # OpenCV decodifica en BGR y el modelo espera RGB, igual que en app.py
+    rgb = cv2.cvtColor(imagen, cv2.COLOR_BGR2RGB)
+    with pool.prestar() as landmarker:
+        resultado = landmarker.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb))
+
+    miniatura = None
+    if ancho_miniatura:
+        alto, ancho = imagen.shape[:2]
+        escala = min(1.0, ancho_miniatura / ancho)
+        miniatura = cv2.resize(imagen, (int(ancho * escala), int(alto * escala)), interpolation=cv2.INTER_AREA)
+
+    if not resultado.pose_landmarks:
+        return ruta, "sin_persona", None, miniatura
+    landmarks = np.array([[lm.x, lm.y, lm.visibility] for lm in resultado.pose_landmarks[0]], dtype=np.float32)
+    return ruta, "ok", landmarks, miniatura
+
+
+def nombre_miniatura(ruta):
+    """
+    Nombre del archivo de la miniatura de una foto.
+
+    Incluye un resumen de la ruta completa para que fotos con el mismo nombre
+    en carpetas distintas (por ejemplo, leídas de la entrada estándar) no se
+    sobrescriban entre sí.
+    """
+    base = os.path.splitext(os.path.basename(ruta))[0]
+    resumen = hashlib.sha1(os.path.abspath(ruta).encode("utf-8")).hexdigest()[:8]
+    return f"{base}_{resumen}.jpg"
+
+
+def en_orden(executor, funcion, elementos, ventana):
+    """
+    Ejecuta `funcion` sobre los elementos en el executor y devuelve los
+    resultados en orden, con como mucho `ventana` tareas en curso.
+    """
+    pendientes = collections.deque()
+    for elemento in elementos:
+        pendientes.append(executor.submit(funcion, elemento))
+        if len(pendientes) >= ventana:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def dibujar_miniatura(miniatura, landmarks, nombres, correctos, todo_correcto):
+    """Marca sobre la miniatura el vértice de cada ángulo con el color de su veredicto."""
+    alto, ancho = miniatura.shape[:2]
+    radio = max(3, ancho // 80)
+    for nombre, correcto in zip(nombres, correctos):
+        x, y, _ = landmarks[ANGULO_LANDMARKS_MAP[nombre][1]]
+        centro = (int(x * ancho), int(y * alto))
+        cv2.circle(miniatura, centro, radio, COLOR_CORRECTO if correcto else COLOR_INCORRECTO, -1)
+        cv2.circle(miniatura, centro, radio, (255, 255, 255), 1)
+    texto = "CORRECTA" if todo_correcto else "A CORREGIR"
+    cv2.putText(miniatura, texto, (8, 24), cv2.FONT_HERSHEY_DUPLEX, 0.7,
+                COLOR_CORRECTO if todo_correcto else COLOR_INCORRECTO, 2)
+
+
+def calificar(postura, rutas, salida_csv, directorio_miniaturas=None, hilos=4, lote=64, ancho_miniatura=320,
+              perfil=None):
+    """
+    Califica una secuencia de fotos frente a una postura.
+
+    Args:
+        postura (str): Nombre de la postura en `POSTURAS_YOGA`.
+        rutas (iterable): Rutas de las fotos.
+        salida_csv (str): Archivo CSV con los veredictos por foto y ángulo.
+        directorio_miniaturas (str): Carpeta para las miniaturas anotadas, o None.
+        hilos (int): Hilos de decodificación y detección (y landmarkers del pool).
+        lote (int): Fotos por lote de evaluación.
+        ancho_miniatura (int): Ancho de las miniaturas en píxeles.
+        perfil (dict): Perfil de hilos del equipo.
+
+    Returns:
+        dict: Número de fotos por estado, fotos con la postura correcta, segundos
+            e imágenes por segundo.
+    """
+    definicion = POSTURAS_YOGA[postura]
+    nombres = nombres_angulos(definicion)
+    objetivos = [definicion[nombre] for nombre in nombres]
+    if directorio_miniaturas:
+        os.makedirs(directorio_miniaturas, exist_ok=True)
+
+    resumen = {"ok": 0, "sin_persona": 0, "ilegible": 0, "correctas": 0}
+
+    def procesar_lote(resultados, escritor, executor):
+        validos = [r for r in resultados if r[1] == "ok"]
+        if validos:
+            angulos = angulos_lote(np.stack([r[2] for r in validos]), nombres)
+            errores, correctos, todo_correcto = veredictos_lote(angulos, definicion, nombres)
+
+        miniaturas = []
+        i = -1
+        for ruta, estado, landmarks, miniatura in resultados:
+            resumen[estado] += 1
+            if estado != "ok":
+                escritor.writerow([ruta, estado, postura, "", "", "", "", "", ""])
+                continue
+            i += 1
+            resumen["correctas"] += int(todo_correcto[i])
+            for k, nombre in enumerate(nombres):
+                valor = angulos[i, k]
+                escritor.writerow([ruta, estado, postura, nombre,
+                                   "" if np.isnan(valor) else f"{valor:.1f}", objetivos[k],
+                                   "" if np.isnan(valor) else f"{errores[i, k]:.1f}",
+                                   int(correctos[i, k]), int(todo_correcto[i])])
+            if miniatura is not None:
+                dibujar_miniatura(miniatura, landmarks, nombres, correctos[i], todo_correcto[i])
+                destino = os.path.join(directorio_miniaturas, nombre_miniatura(ruta))
+                miniaturas.append(executor.submit(cv2.imwrite, destino, miniatura))
+        for futuro in miniaturas:
+            futuro.result()
+
+    with PoolLandmarkers(hilos, perfil) as pool, ThreadPoolExecutor(hilos) as executor, \
+            open(salida_csv, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(COLUMNAS)
+        # La carga de los modelos del pool no cuenta en el rendimiento
+        t0 = time.perf_counter()
+
+        ancho = ancho_miniatura if directorio_miniaturas else None
+        pendientes = []
+        # Dos lotes en vuelo para que los hilos no esperen a la evaluación
+        for resultado in en_orden(executor, lambda ruta: detectar(ruta, pool, ancho), rutas, 2 * lote):
+            pendientes.append(resultado)
+            if len(pendientes) == lote:
+                procesar_lote(pendientes, escritor, executor)
+                pendientes = []
+        if pendientes:
+            procesar_lote(pendientes, escritor, executor)
+        resumen["segundos"] = time.perf_counter() - t0
+
+    total = resumen["ok"] + resumen["sin_persona"] + resumen["ilegible"]
+    resumen["imagenes_s"] = total / resumen["segundos"] if resumen["segundos"] > 0 else 0.0
+    return resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calificación por lotes de fotos de una postura")
+    parser.add_argument("postura", choices=sorted(POSTURAS_YOGA), help="Postura de referencia")
+    parser.add_argument("entrada", help="Directorio de fotos, o '-' para leer rutas de la entrada estándar")
+    parser.add_argument("--salida", default="calificaciones.csv", help="CSV de veredictos por foto y ángulo")
+    parser.add_argument("--miniaturas", default=None, help="Carpeta para las miniaturas anotadas")
+    parser.add_argument("--ancho-miniatura", type=int, default=320)
+    parser.add_argument("--hilos", type=int, default=min(8, os.cpu_count() or 1),
+                        help="Hilos de decodificación y detección")
+    parser.add_argument("--lote", type=int, default=64, help="Fotos por lote de evaluación")
+    args = parser.parse_args()
+
+    # El paralelismo está en las fotos: si OpenCV reparte además cada imagen entre
+    # núcleos, los hilos se estorban. Del perfil del equipo solo se usa el delegado.
+    cv2.setNumThreads(1)
+    perfil_hilos = cargar_perfil() if config.aplicar_perfil_hilos else None
+
+    resumen = calificar(args.postura, listar_imagenes(args.entrada), args.salida, args.miniaturas,
+                        hilos=args.hilos, lote=args.lote, ancho_miniatura=args.ancho_miniatura,
+                        perfil=perfil_hilos)
+    total = resumen["ok"] + resumen["sin_persona"] + resumen["ilegible"]
+    print(f"{total} fotos en {resumen['segundos']:.1f} s ({resumen['imagenes_s']:.1f} imágenes/s): "
+          f"{resumen['correctas']} correctas, {resumen['ok'] - resumen['correctas']} a corregir, "
+          f"{resumen['sin_persona']} sin persona, {resumen['ilegible']} ilegibles")
+    print(f"Veredictos en {args.salida}")
@@ -0,0 +1,308 @@
+"""
+Capa de captura de vídeo de baja latencia.
+
+Este módulo define `Camara`, un envoltorio sobre `cv2.VideoCapture` que negocia
+con el driver la resolución, la frecuencia, el formato de píxel (MJPG/YUYV) y
+el tamaño del buffer interno antes de empezar a leer. También permite descartar
+fotogramas antiguos acumulados en el buffer, informa de los ajustes que el driver
+ha aceptado realmente y mide la latencia entre la captura y la presentación.
+
+Un archivo de vídeo puede usarse como fuente en lugar de una cámara, lo que
+permite probar la aplicación sin hardware. También se aceptan URL de flujos
+(rtsp://, http://) y tuberías de GStreamer, que se pasan tal cual a OpenCV.
+
+Uso como sonda de latencia:
+    python camara.py [fuente] [--segundos N]
+"""
+
+import argparse
+import collections
+import os
+import time
+
+import cv2
+
+
+def _parece_ruta(fuente):
+    """
+    Indica si una fuente de texto es una ruta de archivo y no una URL de flujo
+    ('rtsp://...') ni una tubería de GStreamer ('... ! appsink').
+    """
+    return "://" not in fuente and "!" not in fuente
+
+
+def _reloj_compartido():
+    """
+    Indica si `time.perf_counter` usa CLOCK_MONOTONIC, el reloj de las marcas de
+    tiempo de los buffers de V4L2.
+    """
+    return "CLOCK_MONOTONIC" in time.get_clock_info("perf_counter").implementation
+
+
+def _decodificar_fourcc(valor):
+    """
+    Convierte el valor numérico de CAP_PROP_FOURCC en su código de cuatro letras.
+
+    Args:
+        valor (float): Valor devuelto por `cap.get(cv2.CAP_PROP_FOURCC)`.
+
+    Returns:
+        str: Código FOURCC (ej. 'MJPG') o cadena vacía si no es válido.
+    """
+    codigo = int(valor)
+    if codigo <= 0:
+        return ""
+    return "".join(chr((codigo >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+
+
+class Camara:
+    """
+    Fuente de fotogramas (cámara o archivo de vídeo) con ajustes negociados.
+
+    Expone la misma interfaz básica que `cv2.VideoCapture` (`isOpened`, `read`,
+    `grab`, `release`) para poder sustituirla directamente en el bucle principal.
+    """
+
+    def __init__(self, fuente=0, resolucion=None, fps=None, formato=None,
+                 buffer=1, repetir=False, muestras_latencia=300):
+        """
+        Args:
+            fuente (int | str): Índice de la cámara, ruta a un archivo de vídeo, URL
+                de un flujo o tubería de GStreamer.
+            resolucion (tuple): Resolución solicitada (ancho, alto), o None.
+            fps (int): Frecuencia solicitada, o None para la del driver.
+            formato (str): Formato de píxel ('MJPG', 'YUYV'), o None.
+            buffer (int): Número de fotogramas del buffer interno del driver.
+            repetir (bool): Volver al inicio al terminar un archivo de vídeo.
+            muestras_latencia (int): Tamaño de la ventana de medidas de latencia.
+        """
+        if isinstance(fuente, str) and fuente.isdigit():
+            fuente = int(fuente)
+        self.fuente = fuente
+        self.es_archivo = isinstance(fuente, str) and _parece_ruta(fuente)
+        self.resolucion = resolucion
+        self.fps = fps
+        self.formato = formato
+        self.buffer = buffer
+        self.repetir = repetir
+
+        self.cap = None
+        self.t_captura = None
+        self.instante_driver = False
+        self._latencias = collections.deque(maxlen=muestras_latencia)
+
+    def abrir(self):
+        """
+        Abre la fuente y solicita al driver los ajustes configurados.
+
+        El formato de píxel se fija antes que la resolución y la frecuencia,
+        ya que algunos backends (V4L2) solo ofrecen ciertas resoluciones y FPS
+        altos en MJPG.
+
+        Returns:
+            bool: True si la fuente se abrió correctamente.
+        """
+        if self.es_archivo and not os.path.exists(self.fuente):
+            print(f"Error: No existe el archivo de vídeo {self.fuente}")
+            return False
+
+        self.cap = cv2.VideoCapture(self.fuente)
+        if not self.cap.isOpened():
+            return False
+
+        # Con V4L2 el instante de captura es la marca de tiempo del buffer, tomada
+        # por el driver con CLOCK_MONOTONIC, en lugar del momento de la lectura
+        self.instante_driver = (isinstance(self.fuente, int) and self.cap.getBackendName() == "V4L2"
+                                and _reloj_compartido())
+
+        if not self.es_archivo:
+            if self.formato:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.formato))
+            if self.resolucion:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolucion[0])
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolucion[1])
+            if self.fps:
+                self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+            if self.buffer:
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer)
+        return True
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def ajustes_negociados(self):
+        """
+        Lee los ajustes que el driver ha aceptado realmente.
+
+        Returns:
+            dict: Ancho, alto, FPS, formato de píxel, tamaño de buffer, backend y
+                origen del instante de captura ('driver' o 'lectura').
+        """
+        return {
+            "ancho": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "alto": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": self.cap.get(cv2.CAP_PROP_FPS),
+            "formato": _decodificar_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            "buffer": int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+            "backend": self.cap.getBackendName(),
+            "instante_captura": "driver" if self.instante_driver else "lectura",
+        }
+
+    def read(self, imagen=None):
+        """
+        Lee el siguiente fotograma y registra el instante de captura.
+
+        El instante es la marca de tiempo del buffer del driver cuando está
+        disponible (ver `abrir`), de modo que la latencia medida incluye el tiempo
+        que el fotograma pasó en el buffer; si no, el momento de la lectura.
+
+        Con `repetir` activo, un archivo de vídeo vuelve al principio al llegar
+        al final en lugar de devolver un error.
+
+        Args:
+            imagen (numpy.ndarray): Buffer del fotograma anterior para reutilizarlo
+                si el tamaño coincide, o None para reservar uno nuevo.
+
+        Returns:
+            tuple: (ret, frame) como `cv2.VideoCapture.read`.
+        """
+        ret, frame = self.cap.read(imagen)
+        if not ret and self.es_archivo and self.repetir:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(imagen)
+        self.t_captura = self._instante_captura() if ret else None
+        return ret, frame
+
+    def _instante_captura(self):
+        ahora = time.perf_counter()
+        if not self.instante_driver:
+            return ahora
+        t_buffer = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        # Una marca posterior a la lectura o de hace más de un segundo no es de
+        # CLOCK_MONOTONIC (algunos drivers usan otro reloj): se usa la lectura
+        return t_buffer if 0 <= ahora - t_buffer < 1.0 else ahora
+
+    def grab(self):
+        return self.cap.grab()
+
+    def drenar(self, max_fotogramas=5):
+        """
+        Descarta los fotogramas antiguos acumulados en el buffer del driver.
+
+        Un `grab` que devuelve inmediatamente proviene del buffer; cuando tarda
+        más de medio periodo es porque ha esperado un fotograma nuevo, y por tanto
+        el buffer ya está vacío.
+
+        Args:
+            max_fotogramas (int): Número máximo de fotogramas a descartar.
+
+        Returns:
+            int: Número de fotogramas descartados.
+        """
+        if self.es_archivo:
+            return 0
+
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        medio_periodo = 0.5 / fps
+        descartados = 0
+        for _ in range(max_fotogramas):
+            t0 = time.perf_counter()
+            if not self.cap.grab():
+                break
+            descartados += 1
+            if time.perf_counter() - t0 > medio_periodo:
+                break
+        return descartados
+
+    def registrar_presentacion(self):
+        """
+        Registra que el último fotograma leído se acaba de mostrar en pantalla.
+
+        Debe llamarse justo después de `cv2.imshow`, antes de la espera de
+        `cv2.waitKey` que marca el ritmo, para no contar el tiempo de reposo. La
+        diferencia con el instante de captura se acumula en la ventana de medidas.
+        """
+        if self.t_captura is not None:
+            self._latencias.append(time.perf_counter() - self.t_captura)
+            self.t_captura = None
+
+    def latencia(self):
+        """
+        Resume la latencia captura-presentación de las últimas medidas.
+
+        Returns:
+            dict: Media, percentil 95 y máximo en milisegundos, y número de
+                muestras. Vacío si todavía no hay medidas.
+        """
+        if not self._latencias:
+            return {}
+        ordenadas = sorted(self._latencias)
+        p95 = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))]
+        return {
+            "media_ms": 1000 * sum(ordenadas) / len(ordenadas),
+            "p95_ms": 1000 * p95,
+            "max_ms": 1000 * ordenadas[-1],
+            "muestras": len(ordenadas),
+        }
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+def camara_desde_config(config, fuente=None):
+    """
+    Crea una `Camara` a partir de los parámetros de `Config`.
+
+    Args:
+        config (Config): Configuración global.
+        fuente (int | str): Fuente alternativa; si es None se usa la de config.
+
+    Returns:
+        Camara: Cámara sin abrir.
+    """
+    return Camara(fuente=config.camara_fuente if fuente is None else fuente,
+                  resolucion=config.camara_resolucion,
+                  fps=config.camara_fps,
+                  formato=config.camara_formato,
+                  buffer=config.camara_buffer,
+                  repetir=config.camara_repetir_video)
+
+
+if __name__ == "__main__":
+    from config import config
+
+    parser = argparse.ArgumentParser(description="Sonda de ajustes y latencia de captura")
+    parser.add_argument("fuente", nargs="?", default=None,
+                        help="Índice de cámara o archivo de vídeo (por defecto, el de config.py)")
+    parser.add_argument("--segundos", type=float, default=10,
+                        help="Duración de la medida en segundos")
+    args = parser.parse_args()
+
+    camara = camara_desde_config(config, args.fuente)
+    if not camara.abrir():
+        print("Error: No se puede abrir la fuente de vídeo.")
+        raise SystemExit(1)
+
+    print("Ajustes negociados:")
+    for clave, valor in camara.ajustes_negociados().items():
+        print(f"  {clave}: {valor}")
+
+    fin = time.perf_counter() + args.segundos
+    fotogramas = 0
+    while time.perf_counter() < fin:
+        ret, frame = camara.read()
+        if not ret:
+            break
+        fotogramas += 1
+        cv2.imshow("Sonda de latencia", frame)
+        camara.registrar_presentacion()
+        if cv2.waitKey(1) & 0xFF == 27:
+            break
+
+    camara.release()
+    cv2.destroyAllWindows()
+
+    print(f"Fotogramas leídos: {fotogramas}")
+    for clave, valor in camara.latencia().items():
+        print(f"  {clave}: {valor:.1f}" if isinstance(valor, float) else f"  {clave}: {valor}")
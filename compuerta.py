@@ -0,0 +1,144 @@
+"""
+Compuerta de inferencia por movimiento y presencia.
+
+Mientras el usuario mantiene una postura, o cuando no hay nadie delante de la
+cámara, los fotogramas consecutivos son casi idénticos y volver a ejecutar el
+detector de pose no aporta nada. `CompuertaInferencia` decide, con una
+diferencia de fotogramas sobre una versión reducida en escala de grises, si
+hace falta una inferencia nueva o basta con reutilizar el último resultado.
+
+Reglas:
+    - Si el movimiento respecto al fotograma de la última inferencia supera el
+      umbral, se infiere.
+    - Si la escena está quieta, se reutilizan los últimos landmarks hasta que
+      pasen `edad_maxima` segundos, momento en que se fuerza un refresco.
+    - Si la última inferencia no encontró a nadie y la escena está quieta, no
+      se infiere hasta que haya movimiento o pasen `edad_maxima_sin_persona`
+      segundos.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+INFERIR = "inferir"
+REUTILIZAR = "reutilizar"
+SIN_PERSONA = "sin_persona"
+
+
+class CompuertaInferencia:
+    """
+    Decide fotograma a fotograma si ejecutar el detector de pose.
+
+    Uso:
+        if compuerta.decidir(frame) == INFERIR:
+            landmarks = ...  # detect_for_video
+            compuerta.registrar(landmarks)
+        landmarks = compuerta.landmarks
+
+    Atributos públicos:
+        landmarks: Últimos landmarks detectados (None si no había nadie).
+        movimiento (float): Fracción de píxeles que cambiaron en el último fotograma.
+        decisiones (dict): Número de fotogramas por decisión y refrescos forzados.
+    """
+
+    def __init__(self, umbral_movimiento=0.02, umbral_pixel=15, ancho=96, edad_maxima=0.5,
+                 edad_maxima_sin_persona=1.0, activa=True, reloj=time.perf_counter):
+        """
+        Args:
+            umbral_movimiento (float): Fracción de píxeles cambiados a partir de la
+                cual se considera que hay movimiento.
+            umbral_pixel (int): Diferencia de intensidad (0-255) para que un píxel
+                cuente como cambiado.
+            ancho (int): Ancho de la imagen reducida sobre la que se compara.
+            edad_maxima (float): Segundos máximos que se reutiliza un resultado
+                con persona.
+            edad_maxima_sin_persona (float): Segundos máximos sin inferir cuando
+                no había nadie.
+            activa (bool): Si es False, se infiere en todos los fotogramas (solo
+                se cuentan las decisiones).
+            reloj (callable): Función que devuelve el tiempo actual en segundos.
+        """
+        self.umbral_movimiento = umbral_movimiento
+        self.umbral_pixel = umbral_pixel
+        self.ancho = ancho
+        self.edad_maxima = edad_maxima
+        self.edad_maxima_sin_persona = edad_maxima_sin_persona
+        self.activa = activa
+        self.reloj = reloj
+
+        self.decisiones = {INFERIR: 0, REUTILIZAR: 0, SIN_PERSONA: 0, "forzadas": 0}
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Olvida el último resultado; el siguiente fotograma siempre se infiere."""
+        self.landmarks = None
+        self.movimiento = 1.0
+        self._referencia = None
+        self._reducido = None
+        self._t_inferencia = None
+
+    def _reducir(self, frame):
+        alto, ancho = frame.shape[:2]
+        tam = (self.ancho, max(1, round(alto * self.ancho / ancho)))
+        gris = cv2.cvtColor(cv2.resize(frame, tam, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        # El suavizado evita que el ruido del sensor cuente como movimiento
+        return cv2.GaussianBlur(gris, (5, 5), 0)
+
+    def decidir(self, frame):
+        """
+        Decide si el fotograma necesita una inferencia nueva.
+
+        Args:
+            frame (numpy.ndarray): Fotograma BGR de la cámara.
+
+        Returns:
+            str: INFERIR, REUTILIZAR (escena quieta con persona) o SIN_PERSONA
+                (escena quieta sin nadie). Con INFERIR hay que llamar después
+                a `registrar`.
+        """
+        self._reducido = self._reducir(frame)
+        ahora = self.reloj()
+
+        if self._referencia is None or self._referencia.shape != self._reducido.shape:
+            decision = INFERIR
+        else:
+            diferencia = cv2.absdiff(self._reducido, self._referencia)
+            self.movimiento = np.count_nonzero(diferencia > self.umbral_pixel) / diferencia.size
+            edad = ahora - self._t_inferencia
+            edad_limite = self.edad_maxima if self.landmarks is not None else self.edad_maxima_sin_persona
+
+            if self.movimiento >= self.umbral_movimiento:
+                decision = INFERIR
+            elif edad >= edad_limite:
+                decision = INFERIR
+                self.decisiones["forzadas"] += 1
+            else:
+                decision = REUTILIZAR if self.landmarks is not None else SIN_PERSONA
+
+        self.decisiones[decision] += 1
+        return INFERIR if not self.activa else decision
+
+    def registrar(self, landmarks):
+        """
+        Guarda el resultado de una inferencia y toma el fotograma como referencia.
+
+        Args:
+            landmarks: Landmarks de la persona detectada, o None si no había nadie.
+        """
+        self.landmarks = landmarks
+        self._referencia = self._reducido
+        self._t_inferencia = self.reloj()
+
+    def metricas(self):
+        """
+        Returns:
+            dict: Fotogramas evaluados, decisiones de cada tipo, refrescos
+                forzados y fracción de inferencias ahorradas (con la compuerta
+                inactiva, la que se habría ahorrado).
+        """
+        fotogramas = self.decisiones[INFERIR] + self.decisiones[REUTILIZAR] + self.decisiones[SIN_PERSONA]
+        ahorradas = fotogramas - self.decisiones[INFERIR]
+        return {"fotogramas": fotogramas, **self.decisiones,
+                "ahorro": ahorradas / fotogramas if fotogramas else 0.0}
@@ -6,6 +6,7 @@ incluyendo rutas de archivos y ajustes de tiempos para la lógica del juego.
 """
 
 import os
+import platform
 
 class Config:
     """
@@ -24,12 +25,120 @@ class Config:
             game_time (int): Duración total de la sesión o juego en segundos.
             circle_time (int): Tiempo en segundos que permanecen visibles los indicadores circulares.
             circle_time_radius (int): Radio de los indicadores visuales de tiempo.
+            segundos_para_superar (int): Segundos que hay que mantener una postura correcta
+                para pasar a la siguiente.
+            fps_objetivo (dict): Fotogramas por segundo objetivo para cada estado del juego.
+                Las pantallas de reposo usan pocos FPS; None desactiva el límite.
+            suspender_camara_en_reposo (bool): Si es True, no se leen fotogramas de la
+                cámara en las pantallas INICIO y TERMINADO.
+            camara_fuente (int | str): Índice de la cámara o ruta a un archivo de vídeo.
+            camara_resolucion (tuple): Resolución solicitada al driver (ancho, alto).
+            camara_fps (int): Frecuencia de captura solicitada al driver.
+            camara_formato (str): Formato de píxel solicitado ('MJPG', 'YUYV' o None).
+            camara_buffer (int): Tamaño del buffer interno del driver en fotogramas.
+            camara_repetir_video (bool): Reiniciar los archivos de vídeo al terminar.
+            registrar_sesiones (bool): Guardar las analíticas de cada sesión.
+            ruta_sesiones (str): Ruta de la base de datos SQLite de sesiones.
+            fotos_path (str): Directorio de las imágenes de fondo y de las posturas.
+            perfiles_render (dict): Perfiles de renderizado disponibles. Cada uno define el
+                tamaño del lienzo y si se dibujan decoraciones y paneles semitransparentes.
+            perfil_render (str): Perfil de renderizado usado por defecto.
+            proporcion_camara (tuple): Fracción del ancho y alto del lienzo ocupada por la cámara.
+            margen_camara (int): Margen superior de la cámara en píxeles del diseño de 1280x720.
+            multiproceso_ranuras (int): Ranuras de los anillos de memoria compartida del
+                modo multiproceso.
+            grabar_sesiones (bool): Grabar en vídeo cada postura de las sesiones.
+            grabacion_path (str): Directorio de los vídeos grabados.
+            grabacion_fuente (str): 'lienzo' para grabar la interfaz compuesta o 'camara'
+                para la imagen de la cámara.
+            grabacion_codec (str): Código FOURCC del códec de vídeo.
+            grabacion_fps (int): Frecuencia de grabación (los fotogramas sobrantes se omiten).
+            grabacion_resolucion (tuple): Resolución de los vídeos, o None para la original.
+            grabacion_max_pendientes (int): Fotogramas en cola antes de empezar a descartar.
+            compuerta_activa (bool): Omitir la inferencia de pose cuando la escena no cambia.
+            compuerta_umbral_movimiento (float): Fracción de píxeles cambiados que obliga
+                a inferir de nuevo.
+            compuerta_umbral_pixel (int): Diferencia de intensidad para contar un píxel
+                como cambiado.
+            compuerta_ancho (int): Ancho de la imagen reducida usada para comparar.
+            compuerta_edad_maxima (float): Segundos máximos que se reutilizan unos landmarks.
+            compuerta_edad_maxima_sin_persona (float): Segundos máximos sin inferir cuando
+                no hay nadie delante de la cámara.
+            modo_kiosco (bool): Volver a la pantalla de inicio al terminar cada sesión y
+                mostrar la telemetría de memoria y FPS.
+            kiosco_segundos_final (float): Segundos que se muestra la pantalla final en
+                modo kiosco.
+            telemetria_intervalo (float): Segundos entre muestras de telemetría.
+            telemetria_top (int): Líneas de código listadas por crecimiento de memoria.
+            telemetria_tracemalloc (bool): Rastrear las asignaciones con tracemalloc en
+                modo kiosco (añade un coste apreciable a cada asignación; se activa
+                para diagnosticar con `--trazar-memoria` y en la prueba de resistencia).
+            aplicar_perfil_hilos (bool): Aplicar al arrancar el perfil de hilos del equipo.
+            ruta_perfil_hilos (str): Archivo del perfil de hilos de este equipo (lo
+                genera `ajuste_hilos.py`).
+            calentar_modelo (bool): Ejecutar una inferencia sobre una imagen vacía en la
+                pantalla de inicio para que el primer fotograma de la sesión no sufra
+                el coste de arranque del modelo.
+            calentamiento_intervalo (float): Segundos entre inferencias de calentamiento
+                mientras se espera en la pantalla de inicio.
+            control_host (str): Dirección del socket de control del modo residente.
+            control_puerto (int): Puerto del socket de control del modo residente.
         """
         self.model_path = os.path.join(os.path.dirname(__file__), 'models/pose_landmarker_full.task')
         self.padding = 100
         self.game_time = 20
         self.circle_time = 1
         self.circle_time_radius = 15
+        self.segundos_para_superar = 3
+        self.fps_objetivo = {
+            "INICIO": 5,
+            "JUGANDO": 30,
+            "TERMINADO": 5
+        }
+        self.suspender_camara_en_reposo = True
+        self.camara_fuente = 0
+        self.camara_resolucion = (1280, 720)
+        self.camara_fps = 30
+        self.camara_formato = "MJPG"
+        self.camara_buffer = 1
+        self.camara_repetir_video = True
+        self.registrar_sesiones = True
+        self.ruta_sesiones = os.path.join(os.path.dirname(__file__), 'datos/sesiones.db')
+        self.fotos_path = os.path.join(os.path.dirname(__file__), 'fotos')
+        self.perfiles_render = {
+            "estandar": {"lienzo": (1280, 720), "decoracion": True, "transparencias": True},
+            "bajo_coste": {"lienzo": (854, 480), "decoracion": False, "transparencias": False},
+            "alta_resolucion": {"lienzo": (1920, 1080), "decoracion": True, "transparencias": True}
+        }
+        self.perfil_render = "estandar"
+        self.proporcion_camara = (900 / 1280, 700 / 720)
+        self.margen_camara = 10
+        self.multiproceso_ranuras = 4
+        self.grabar_sesiones = False
+        self.grabacion_path = os.path.join(os.path.dirname(__file__), 'datos/grabaciones')
+        self.grabacion_fuente = "lienzo"
+        self.grabacion_codec = "mp4v"
+        self.grabacion_fps = 15
+        self.grabacion_resolucion = None
+        self.grabacion_max_pendientes = 30
+        self.compuerta_activa = True
+        self.compuerta_umbral_movimiento = 0.02
+        self.compuerta_umbral_pixel = 15
+        self.compuerta_ancho = 96
+        self.compuerta_edad_maxima = 0.5
+        self.compuerta_edad_maxima_sin_persona = 1.0
+        self.modo_kiosco = False
+        self.kiosco_segundos_final = 10
+        self.telemetria_intervalo = 60
+        self.telemetria_top = 5
+        self.telemetria_tracemalloc = False
+        self.aplicar_perfil_hilos = True
+        self.ruta_perfil_hilos = os.path.join(os.path.dirname(__file__),
+                                              f'datos/hilos_{platform.node() or "local"}.json')
+        self.calentar_modelo = True
+        self.calentamiento_intervalo = 30
+        self.control_host = "127.0.0.1"
+        self.control_puerto = 8765
 
 # Instancia global exportada para ser importada por otros módulos
 config = Config()
\ No newline at end of file
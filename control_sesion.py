@@ -0,0 +1,150 @@
+"""
+Control de la aplicación residente por un socket local.
+
+Con `python app.py --demonio` la aplicación queda abierta con el modelo cargado
+y los recursos decodificados, y escucha órdenes de texto (una por conexión) en
+`config.control_host:config.control_puerto`:
+
+    iniciar            Comienza una sesión si está en la pantalla de inicio.
+    iniciar esperar    Igual, pero responde cuando se ha puntuado el primer
+                       fotograma, con los milisegundos transcurridos.
+    estado             Devuelve el estado de la sesión.
+    salir              Cierra la aplicación.
+
+Este módulo define el servidor que usa app.py y, ejecutado como script, el
+cliente. El cliente no importa OpenCV ni MediaPipe para que arranque al instante.
+
+Uso:
+    python control_sesion.py iniciar [--esperar]
+    python control_sesion.py estado
+    python control_sesion.py salir
+"""
+
+import argparse
+import queue
+import socket
+import socketserver
+import threading
+import time
+
+from config import config
+
+
+class Orden:
+    """
+    Orden recibida por el socket, pendiente de respuesta desde el bucle principal.
+
+    Atributos públicos:
+        comando (str): Primera palabra de la orden ('iniciar', 'estado', 'salir').
+        argumentos (list): Resto de palabras.
+    """
+
+    def __init__(self, comando, argumentos):
+        self.comando = comando
+        self.argumentos = argumentos
+        self._respuesta = queue.Queue(maxsize=1)
+
+    def responder(self, texto):
+        """Envía la respuesta al cliente y cierra la conexión."""
+        self._respuesta.put(texto)
+
+
+class _Manejador(socketserver.StreamRequestHandler):
+    def handle(self):
+        palabras = self.rfile.readline(256).decode("utf-8", "replace").split()
+        if not palabras:
+            return
+        orden = Orden(palabras[0].lower(), palabras[1:])
+        self.server.ordenes.put(orden)
+        try:
+            texto = orden._respuesta.get(timeout=self.server.timeout_respuesta)
+        except queue.Empty:
+            texto = "error sin respuesta"
+        self.wfile.write((texto + "\n").encode("utf-8"))
+
+
+class _ServidorTCP(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ServidorControl:
+    """
+    Servidor de órdenes en un hilo aparte.
+
+    El bucle principal recoge las órdenes con `pendientes` y contesta a cada
+    una con `Orden.responder`, de modo que el estado de la sesión solo se
+    modifica desde el bucle.
+    """
+
+    def __init__(self, host=None, puerto=None, timeout_respuesta=60):
+        """
+        Args:
+            host (str): Dirección de escucha; por defecto `config.control_host`.
+            puerto (int): Puerto de escucha; por defecto `config.control_puerto`.
+            timeout_respuesta (float): Segundos que una conexión espera respuesta.
+        """
+        self._servidor = _ServidorTCP((host or config.control_host, puerto or config.control_puerto), _Manejador)
+        self._servidor.ordenes = queue.Queue()
+        self._servidor.timeout_respuesta = timeout_respuesta
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, name="control", daemon=True)
+        self._hilo.start()
+
+    def pendientes(self):
+        """
+        Yields:
+            Orden: Órdenes recibidas desde la última llamada (sin bloquear).
+        """
+        while True:
+            try:
+                yield self._servidor.ordenes.get_nowait()
+            except queue.Empty:
+                return
+
+    def cerrar(self):
+        """Deja de escuchar y responde a las órdenes que no se han atendido."""
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        for orden in self.pendientes():
+            orden.responder("error cerrando")
+
+
+def enviar(orden, host=None, puerto=None, timeout=60):
+    """
+    Envía una orden a la aplicación residente.
+
+    Args:
+        orden (str): Texto de la orden (ej. 'iniciar esperar').
+        host (str): Dirección de la aplicación; por defecto `config.control_host`.
+        puerto (int): Puerto; por defecto `config.control_puerto`.
+        timeout (float): Segundos máximos de espera.
+
+    Returns:
+        str: Respuesta de la aplicación.
+    """
+    direccion = (host or config.control_host, puerto or config.control_puerto)
+    with socket.create_connection(direccion, timeout=timeout) as conexion:
+        conexion.sendall((orden + "\n").encode("utf-8"))
+        with conexion.makefile("r", encoding="utf-8") as f:
+            return f.readline().strip()
+
+
+if __name__ == "__main__":
+    t_arranque = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Control de la aplicación residente")
+    parser.add_argument("orden", choices=["iniciar", "estado", "salir"])
+    parser.add_argument("--esperar", action="store_true",
+                        help="Con 'iniciar', esperar al primer fotograma puntuado")
+    parser.add_argument("--puerto", type=int, default=config.control_puerto)
+    args = parser.parse_args()
+
+    texto = args.orden + (" esperar" if args.esperar else "")
+    try:
+        respuesta = enviar(texto, puerto=args.puerto)
+    except OSError as e:
+        raise SystemExit(f"No se puede contactar con la aplicación ({e}). ¿Está en marcha con --demonio?")
+
+    print(respuesta)
+    if args.esperar:
+        print(f"Desde la orden hasta el primer fotograma puntuado: "
+              f"{1000 * (time.perf_counter() - t_arranque):.0f} ms")
@@ -1,33 +1,284 @@
-import requests
+"""
+Descarga de los modelos de MediaPipe Pose Landmarker.
+
+Los modelos se describen en `modelos.json` (URL y SHA-256 de cada archivo) y se
+descargan en paralelo. Cada descarga se escribe en un archivo temporal `.part`
+que se reanuda con peticiones HTTP Range si se interrumpe, se verifica contra la
+suma SHA-256 del manifiesto y solo entonces se renombra a su nombre definitivo,
+de modo que nunca queda un modelo corrupto o a medias en `models/`.
+
+Para aprovisionar muchos equipos se puede usar un espejo local: un directorio
+con los archivos `.task` o la URL base de un servidor HTTP de la red local
+(por ejemplo `python -m http.server` sobre ese directorio).
+
+Uso:
+    python download_models.py [--espejo DIR_O_URL] [--hilos N] [--actualizar-manifiesto]
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
 import os
+import shutil
+import sys
+
+import requests
 import tqdm
 
-url = {
-    "pose_landmarker_lite.task": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task",
-    "pose_landmarker_full.task": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/latest/pose_landmarker_full.task",
-    "pose_landmarker_heavy.task": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_heavy/float16/latest/pose_landmarker_heavy.task"
-}
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_MODELOS = os.path.join(DIRECTORIO, 'models')
+MANIFIESTO = os.path.join(DIRECTORIO, 'modelos.json')
+
+TAM_BLOQUE = 1024 * 1024
+INTENTOS = 3
+
+
+def cargar_manifiesto(ruta=MANIFIESTO):
+    """
+    Lee el manifiesto de modelos.
+
+    Args:
+        ruta (str): Ruta del archivo JSON.
+
+    Returns:
+        dict: Nombre del archivo -> {"url": str, "sha256": str | None}.
+    """
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def sha256_archivo(ruta):
+    """
+    Calcula la suma SHA-256 de un archivo leyéndolo por bloques.
+
+    Returns:
+        str: Suma en hexadecimal.
+    """
+    suma = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(TAM_BLOQUE), b''):
+            suma.update(bloque)
+    return suma.hexdigest()
+
+
+def _verificar(ruta, sha256_esperado):
+    """
+    Comprueba un archivo contra la suma del manifiesto.
+
+    Returns:
+        bool: True si coincide. Sin suma en el manifiesto no se puede verificar
+            y se devuelve False.
+    """
+    if not sha256_esperado:
+        return False
+    return sha256_archivo(ruta) == sha256_esperado.lower()
+
+
+def _leer_estado(parcial):
+    """Validador (ETag o Last-Modified) y tamaño total guardados junto al archivo `.part`."""
+    try:
+        with open(parcial + '.json', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar_estado(parcial, validador, total):
+    with open(parcial + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'validador': validador, 'total': total}, f)
+
+
+def _borrar_parcial(parcial):
+    for ruta in (parcial, parcial + '.json'):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+
+def _total_content_range(valor):
+    """
+    Tamaño total del recurso según una cabecera Content-Range
+    ('bytes 100-199/1000' o 'bytes */1000').
 
-for key, value in url.items():
-    print(f"Descargando {key} desde {value}")
-    # Crear el directorio de destino si no existe
-    os.makedirs(os.path.join(os.path.dirname(__file__), 'models'), exist_ok=True)
-    # Definir la ruta de destino
-    archivo_destino = os.path.join(os.path.join(os.path.dirname(__file__), 'models'), key)
+    Returns:
+        tuple: (inicio del rango o None, total o None).
+    """
+    if not valor or not valor.startswith('bytes '):
+        return None, None
+    rango, _, total = valor[6:].partition('/')
+    inicio = int(rango.split('-')[0]) if rango != '*' and rango.split('-')[0].isdigit() else None
+    return inicio, int(total) if total.isdigit() else None
+
+
+def _descargar_http(url, parcial, nombre, posicion):
+    """
+    Descarga (o reanuda) una URL sobre un archivo `.part`.
+
+    Junto al archivo parcial se guarda el validador del servidor (ETag o
+    Last-Modified) y el tamaño total. Al reanudar se pide el resto con Range e
+    If-Range, de modo que si el archivo remoto ha cambiado el servidor responde
+    200 con el archivo entero y la descarga empieza de cero en vez de mezclar
+    dos versiones. Sin validador guardado no se reanuda.
+
+    Raises:
+        requests.RequestException: Si la descarga falla tras todos los intentos.
+    """
+    for intento in range(1, INTENTOS + 1):
+        estado = _leer_estado(parcial)
+        desplazamiento = os.path.getsize(parcial) if os.path.exists(parcial) else 0
+        if desplazamiento and not estado.get('validador'):
+            _borrar_parcial(parcial)
+            desplazamiento = 0
+        cabeceras = {}
+        if desplazamiento:
+            cabeceras = {'Range': f'bytes={desplazamiento}-', 'If-Range': estado['validador']}
+        try:
+            with requests.get(url, stream=True, headers=cabeceras, timeout=30) as response:
+                if response.status_code == 416:
+                    _, total = _total_content_range(response.headers.get('content-range'))
+                    total = total or estado.get('total')
+                    if total is not None and desplazamiento == total:
+                        # El archivo parcial ya está completo
+                        return
+                    # El parcial no corresponde al archivo remoto: se empieza de cero
+                    _borrar_parcial(parcial)
+                    raise requests.HTTPError(f"Rango no satisfacible con {desplazamiento} bytes locales")
+                if response.status_code == 200:
+                    desplazamiento = 0
+                    longitud = response.headers.get('content-length')
+                    total = int(longitud) if longitud and longitud.isdigit() else None
+                elif response.status_code == 206:
+                    inicio, total = _total_content_range(response.headers.get('content-range'))
+                    if inicio != desplazamiento:
+                        _borrar_parcial(parcial)
+                        raise requests.HTTPError(f"Rango inesperado: {response.headers.get('content-range')}")
+                else:
+                    response.raise_for_status()
+                    raise requests.HTTPError(f"Respuesta inesperada {response.status_code}")
+
+                if response.status_code == 200:
+                    validador = response.headers.get('etag') or response.headers.get('last-modified')
+                    _guardar_estado(parcial, validador, total)
+
+                modo = 'ab' if desplazamiento else 'wb'
+                with open(parcial, modo) as f, tqdm.tqdm(total=total, initial=desplazamiento, unit='iB',
+                                                         unit_scale=True, desc=nombre,
+                                                         position=posicion, leave=False) as progreso:
+                    for chunk in response.iter_content(chunk_size=TAM_BLOQUE):
+                        f.write(chunk)
+                        progreso.update(len(chunk))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            recibido = os.path.getsize(parcial)
+            if total is not None and recibido != total:
+                # Conexión cortada: el siguiente intento reanuda desde lo recibido
+                raise requests.ConnectionError(f"Recibidos {recibido} de {total} bytes")
+            return
+        except requests.RequestException:
+            if intento == INTENTOS:
+                raise
+            print(f"Reintentando {nombre} ({intento}/{INTENTOS})...")
+
+
+def descargar_modelo(nombre, entrada, destino=DIRECTORIO_MODELOS, espejo=None, posicion=0, sin_verificar=False):
+    """
+    Obtiene un modelo, lo verifica y lo instala de forma atómica.
+
+    Args:
+        nombre (str): Nombre del archivo del modelo.
+        entrada (dict): Entrada del manifiesto con "url" y "sha256".
+        destino (str): Directorio de los modelos.
+        espejo (str): Directorio local o URL base alternativa, o None.
+        posicion (int): Línea de la barra de progreso.
+        sin_verificar (bool): Instalar aunque el manifiesto no tenga suma para el
+            modelo (solo para fijarla después con `actualizar_manifiesto`).
+
+    Returns:
+        tuple: (nombre, estado) con estado 'presente', 'descargado' o un mensaje de error.
+    """
+    archivo_destino = os.path.join(destino, nombre)
+    parcial = archivo_destino + '.part'
+    sha256 = entrada.get('sha256')
+
+    if not sha256 and not sin_verificar:
+        return nombre, 'error: sin suma SHA-256 en el manifiesto'
 
     if os.path.exists(archivo_destino):
-        print(f"El archivo {archivo_destino} ya existe. Omitiendo descarga.")
-        continue
-
-    # Descargar el archivo
-    response = requests.get(value, stream=True)
-    if response.status_code == 200:
-        with open(archivo_destino, 'wb') as f:
-            total_size = int(response.headers.get('content-length', 0))
-            progress_bar = tqdm.tqdm(total=total_size, unit='iB', unit_scale=True)
-            for chunk in response.iter_content(chunk_size=8192):
-                progress_bar.update(len(chunk))
-                f.write(chunk)
-        print("\nDescarga completada.")
-    else:
-        print(f"\nError al descargar: {response.status_code}")
\ No newline at end of file
+        if (not sha256 and sin_verificar) or _verificar(archivo_destino, sha256):
+            return nombre, 'presente'
+        print(f"El archivo {archivo_destino} no coincide con el manifiesto. Se descargará de nuevo.")
+        os.remove(archivo_destino)
+
+    try:
+        if espejo and os.path.isdir(espejo):
+            shutil.copyfile(os.path.join(espejo, nombre), parcial)
+        else:
+            url = f"{espejo.rstrip('/')}/{nombre}" if espejo else entrada['url']
+            _descargar_http(url, parcial, nombre, posicion)
+    except (OSError, requests.RequestException) as e:
+        return nombre, f"error: {e}"
+
+    if sha256 and not _verificar(parcial, sha256):
+        _borrar_parcial(parcial)
+        return nombre, 'error: la suma SHA-256 no coincide'
+
+    os.replace(parcial, archivo_destino)
+    if os.path.exists(parcial + '.json'):
+        os.remove(parcial + '.json')
+    return nombre, 'descargado'
+
+
+def actualizar_manifiesto(manifiesto, ruta=MANIFIESTO, destino=DIRECTORIO_MODELOS):
+    """
+    Fija en el manifiesto la suma SHA-256 de los modelos ya descargados.
+
+    Se usa una vez sobre una descarga de confianza para que el resto de equipos
+    verifiquen contra esas sumas. Las sumas que ya estaban fijadas no se cambian.
+    """
+    for nombre, entrada in manifiesto.items():
+        archivo = os.path.join(destino, nombre)
+        if os.path.exists(archivo) and not entrada.get('sha256'):
+            entrada['sha256'] = sha256_archivo(archivo)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, indent=4)
+        f.write('\n')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Descarga de los modelos de MediaPipe Pose")
+    parser.add_argument('--espejo', help="Directorio local o URL base con los archivos .task")
+    parser.add_argument('--hilos', type=int, default=3, help="Descargas simultáneas")
+    parser.add_argument('--manifiesto', default=MANIFIESTO, help="Archivo JSON con URLs y sumas SHA-256")
+    parser.add_argument('--actualizar-manifiesto', action='store_true',
+                        help="Guardar en el manifiesto las sumas de los modelos descargados")
+    args = parser.parse_args()
+
+    manifiesto = cargar_manifiesto(args.manifiesto)
+    os.makedirs(DIRECTORIO_MODELOS, exist_ok=True)
+
+    sin_suma = [nombre for nombre, entrada in manifiesto.items() if not entrada.get('sha256')]
+    if sin_suma:
+        if args.actualizar_manifiesto:
+            print(f"Aviso: sin suma SHA-256 en el manifiesto para {', '.join(sin_suma)}; "
+                  f"se fijará la de esta descarga.")
+        else:
+            print(f"Sin suma SHA-256 en el manifiesto para {', '.join(sin_suma)}: no se instalarán. "
+                  f"Fíjelas con --actualizar-manifiesto desde una red de confianza.")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.hilos) as executor:
+        futuros = [executor.submit(descargar_modelo, nombre, entrada, DIRECTORIO_MODELOS, args.espejo, i,
+                                   args.actualizar_manifiesto)
+                   for i, (nombre, entrada) in enumerate(manifiesto.items())]
+        resultados = [futuro.result() for futuro in futuros]
+
+    errores = 0
+    for nombre, estado in resultados:
+        print(f"{nombre}: {estado}")
+        errores += estado.startswith('error')
+
+    if args.actualizar_manifiesto and not errores:
+        actualizar_manifiesto(manifiesto, args.manifiesto)
+        print(f"Manifiesto actualizado: {args.manifiesto}")
+
+    sys.exit(1 if errores else 0)
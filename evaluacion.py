@@ -0,0 +1,178 @@
+"""
+Evaluación de los ángulos corporales frente a la definición de una postura.
+
+Este módulo agrupa el cálculo geométrico de ángulos y su comparación con los
+objetivos de `POSTURAS_YOGA`. Ofrece dos variantes:
+
+    - Por fotograma (`evaluar_postura`), sobre los landmarks de MediaPipe, usada
+      en el bucle de vídeo para colorear las articulaciones.
+    - Por lotes (`angulos_lote`, `veredictos_lote`), sobre arrays NumPy de forma
+      (N, 33, 3) con columnas x, y, visibility, usada por el simulador y la
+      calificación de fotos para evaluar muchos fotogramas a la vez.
+"""
+
+import numpy as np
+
+from angulos import ANGULO_LANDMARKS_MAP
+
+VISIBILIDAD_MINIMA = 0.5
+
+COLOR_CORRECTO = (0, 255, 0)
+COLOR_INCORRECTO = (0, 0, 255)
+
+
+def calcular_angulo(a, b, c):
+    """
+    Calcula el ángulo geométrico en grados en el vértice 'b' formado por los puntos a, b y c.
+
+    Utiliza el producto escalar de vectores para determinar el ángulo. Verifica la
+    visibilidad de los landmarks antes de calcular.
+
+    Args:
+        a (Landmark): Primer punto (ej. cadera).
+        b (Landmark): Vértice del ángulo (ej. rodilla).
+        c (Landmark): Tercer punto (ej. tobillo).
+
+    Returns:
+        float: El ángulo en grados (0-180).
+        None: Si la visibilidad de algún punto es baja o hay error matemático.
+    """
+    if a.visibility < VISIBILIDAD_MINIMA or b.visibility < VISIBILIDAD_MINIMA or c.visibility < VISIBILIDAD_MINIMA:
+        return None
+
+    A = np.array([a.x, a.y])
+    B = np.array([b.x, b.y])
+    C = np.array([c.x, c.y])
+
+    # Vectores BA y BC
+    ba = A - B
+    bc = C - B
+
+    prod_escalar = np.dot(ba, bc)
+    magnitud_ba = np.linalg.norm(ba)
+    magnitud_bc = np.linalg.norm(bc)
+
+    if magnitud_ba == 0 or magnitud_bc == 0:
+        return None
+
+    cos_theta = prod_escalar / (magnitud_ba * magnitud_bc)
+    cos_theta = np.clip(cos_theta, -1.0, 1.0)
+    angulo_rad = np.arccos(cos_theta)
+    angulo_grados = np.degrees(angulo_rad)
+
+    return angulo_grados
+
+
+def nombres_angulos(definicion_postura):
+    """
+    Devuelve los nombres de los ángulos evaluados en una postura.
+
+    Args:
+        definicion_postura (dict): Entrada de `POSTURAS_YOGA`.
+
+    Returns:
+        list: Nombres de ángulo en el orden de la definición (sin 'tolerancia').
+    """
+    return [nombre for nombre in definicion_postura if nombre != "tolerancia"]
+
+
+def evaluar_postura(person_landmarks, definicion_postura):
+    """
+    Compara los ángulos de una persona con los objetivos de una postura.
+
+    Args:
+        person_landmarks (list): Landmarks de una persona devueltos por MediaPipe.
+        definicion_postura (dict): Entrada de `POSTURAS_YOGA`.
+
+    Returns:
+        tuple: (angulos, colores, todo_correcto) donde `angulos` asocia cada nombre
+            de ángulo a (valor, error), con ambos None si no es visible; `colores`
+            asocia el índice del vértice al color de feedback; y `todo_correcto`
+            indica si todos los ángulos están dentro de la tolerancia.
+    """
+    angulos = {}
+    colores = {}
+    todo_correcto = True
+
+    for angulo_nombre in nombres_angulos(definicion_postura):
+        angulo_objetivo = definicion_postura[angulo_nombre]
+        p1_idx, p2_idx, p3_idx = ANGULO_LANDMARKS_MAP[angulo_nombre]
+        p1, p2, p3 = person_landmarks[p1_idx], person_landmarks[p2_idx], person_landmarks[p3_idx]
+
+        angulo_usuario = calcular_angulo(p1, p2, p3)
+
+        color_articulacion = COLOR_INCORRECTO # Rojo por defecto
+
+        if angulo_usuario is None:
+            todo_correcto = False
+            angulos[angulo_nombre] = (None, None)
+        else:
+            error = abs(angulo_usuario - angulo_objetivo)
+            angulos[angulo_nombre] = (float(angulo_usuario), float(error))
+            if error <= definicion_postura["tolerancia"]:
+                color_articulacion = COLOR_CORRECTO # Verde si es correcto
+            else:
+                todo_correcto = False
+        colores[p2_idx] = color_articulacion
+
+    return angulos, colores, todo_correcto
+
+
+def landmarks_a_array(person_landmarks):
+    """
+    Convierte los landmarks de MediaPipe en un array (33, 3) con x, y, visibility.
+
+    Returns:
+        numpy.ndarray: Array float32 con una fila por landmark.
+    """
+    return np.array([[lm.x, lm.y, lm.visibility] for lm in person_landmarks], dtype=np.float32)
+
+
+def angulos_lote(landmarks, nombres):
+    """
+    Calcula varios ángulos sobre un lote de fotogramas de forma vectorizada.
+
+    Args:
+        landmarks (numpy.ndarray): Array (N, 33, 3) con x, y, visibility.
+        nombres (list): Nombres de ángulo de `ANGULO_LANDMARKS_MAP`.
+
+    Returns:
+        numpy.ndarray: Array (N, K) en grados, con NaN donde algún punto no es
+            visible o el ángulo no está definido.
+    """
+    indices = np.array([ANGULO_LANDMARKS_MAP[nombre] for nombre in nombres])
+    puntos = landmarks[:, indices, :]  # (N, K, 3, 3)
+
+    ba = puntos[:, :, 0, :2] - puntos[:, :, 1, :2]
+    bc = puntos[:, :, 2, :2] - puntos[:, :, 1, :2]
+    magnitudes = np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cos_theta = np.sum(ba * bc, axis=-1) / magnitudes
+    angulos = np.degrees(np.arccos(np.clip(cos_theta, -1.0, 1.0)))
+
+    no_visible = puntos[:, :, :, 2].min(axis=-1) < VISIBILIDAD_MINIMA
+    angulos[no_visible | (magnitudes == 0)] = np.nan
+    return angulos
+
+
+def veredictos_lote(angulos, definicion_postura, nombres=None):
+    """
+    Compara un lote de ángulos con los objetivos de una postura.
+
+    Args:
+        angulos (numpy.ndarray): Array (N, K) de ángulos en grados (NaN si no visible).
+        definicion_postura (dict): Entrada de `POSTURAS_YOGA`.
+        nombres (list): Nombres de las K columnas; por defecto los de la definición.
+
+    Returns:
+        tuple: (errores, correctos, todo_correcto) con formas (N, K), (N, K) y (N,).
+            Un ángulo no visible cuenta como incorrecto.
+    """
+    if nombres is None:
+        nombres = nombres_angulos(definicion_postura)
+    objetivos = np.array([definicion_postura[nombre] for nombre in nombres], dtype=np.float64)
+    errores = np.abs(angulos - objetivos)
+    with np.errstate(invalid="ignore"):
+        correctos = errores <= definicion_postura["tolerancia"]
+    return errores, correctos, correctos.all(axis=1)
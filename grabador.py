@@ -0,0 +1,183 @@
+"""
+Grabación de sesiones en segundo plano.
+
+Este módulo define `GrabadorSesion`, que guarda en vídeo el lienzo compuesto o la
+imagen de la cámara sin penalizar el bucle de renderizado. El bucle solo copia el
+fotograma y lo deja en una cola acotada; un hilo codificador dedicado lo escala
+y lo escribe con `cv2.VideoWriter` (que libera el GIL mientras codifica).
+
+Si el codificador no da abasto y la cola se llena, los fotogramas se descartan
+en lugar de bloquear el bucle, y se cuentan. La frecuencia de grabación se
+limita por tiempo (diezmado), y cada etiqueta distinta (por ejemplo, cada
+postura de una sesión) se guarda en un archivo de vídeo propio.
+"""
+
+import os
+import queue
+import re
+import threading
+import time
+
+import cv2
+
+
+class GrabadorSesion:
+    """
+    Grabador de vídeo con hilo codificador, diezmado y segmentación por etiqueta.
+
+    Atributos públicos (contadores):
+        recibidos (int): Fotogramas entregados a `escribir`.
+        diezmados (int): Fotogramas omitidos por el límite de frecuencia.
+        descartados (int): Fotogramas perdidos porque la cola estaba llena.
+        fallidos (int): Fotogramas perdidos porque no se pudo crear el archivo
+            de su segmento o falló la codificación.
+        escritos (int): Fotogramas codificados en disco.
+        segmentos (list): Rutas de los archivos creados.
+    """
+
+    def __init__(self, directorio, codec="mp4v", fps=15, resolucion=None, max_pendientes=30,
+                 extension=".mp4", reloj=time.perf_counter):
+        """
+        Args:
+            directorio (str): Carpeta donde se guardan los segmentos.
+            codec (str): Código FOURCC del códec (ej. 'mp4v', 'MJPG', 'avc1').
+            fps (float): Frecuencia de grabación; los fotogramas que llegan más
+                rápido se omiten.
+            resolucion (tuple): Resolución de salida (ancho, alto), o None para
+                conservar la del fotograma.
+            max_pendientes (int): Capacidad de la cola de codificación.
+            extension (str): Extensión de los archivos de vídeo.
+            reloj (callable): Función que devuelve el tiempo actual en segundos.
+        """
+        self.directorio = directorio
+        self.codec = codec
+        self.fps = fps
+        self.resolucion = resolucion
+        self.extension = extension
+        self.reloj = reloj
+
+        self.recibidos = 0
+        self.diezmados = 0
+        self.descartados = 0
+        self.fallidos = 0
+        self.escritos = 0
+        self.segmentos = []
+
+        self._siguiente = None
+        self._cola = queue.Queue(maxsize=max_pendientes)
+        os.makedirs(directorio, exist_ok=True)
+        self._hilo = threading.Thread(target=self._codificador, name="grabador", daemon=True)
+        self._hilo.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def escribir(self, fotograma, etiqueta):
+        """
+        Entrega un fotograma para grabar sin bloquear.
+
+        Args:
+            fotograma (numpy.ndarray): Imagen BGR. Se copia antes de encolarla, por
+                lo que el llamante puede reutilizar el buffer.
+            etiqueta (str): Segmento al que pertenece; un cambio de etiqueta abre
+                un archivo nuevo.
+
+        Returns:
+            bool: True si el fotograma se encoló para codificarse.
+        """
+        self.recibidos += 1
+        ahora = self.reloj()
+        periodo = 1.0 / self.fps
+        if self._siguiente is not None and ahora < self._siguiente:
+            self.diezmados += 1
+            return False
+        siguiente = (ahora if self._siguiente is None else self._siguiente) + periodo
+        # Si el bucle va con retraso no se intenta recuperar la cadencia
+        self._siguiente = siguiente if siguiente > ahora else ahora + periodo
+
+        try:
+            self._cola.put_nowait((etiqueta, fotograma.copy()))
+        except queue.Full:
+            self.descartados += 1
+            return False
+        return True
+
+    def _ruta_segmento(self, etiqueta):
+        nombre = re.sub(r"[^\w.-]+", "_", etiqueta)
+        return os.path.join(self.directorio, f"{nombre}{self.extension}")
+
+    def _codificador(self):
+        """
+        Bucle del hilo codificador: abre un archivo por etiqueta y escribe los fotogramas.
+
+        Los fotogramas de un segmento cuyo archivo no se puede crear, o cuya
+        codificación falla, se cuentan en `fallidos`; el hilo sigue vaciando la
+        cola para que `escribir` y `cerrar` nunca se bloqueen.
+        """
+        writer = None
+        etiqueta_actual = None
+        while True:
+            elemento = self._cola.get()
+            if elemento is None:
+                break
+            etiqueta, fotograma = elemento
+
+            try:
+                if self.resolucion and (fotograma.shape[1], fotograma.shape[0]) != tuple(self.resolucion):
+                    fotograma = cv2.resize(fotograma, tuple(self.resolucion), interpolation=cv2.INTER_AREA)
+
+                if etiqueta != etiqueta_actual:
+                    if writer is not None:
+                        writer.release()
+                        writer = None
+                    etiqueta_actual = etiqueta
+                    ruta = self._ruta_segmento(etiqueta)
+                    alto, ancho = fotograma.shape[:2]
+                    writer = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*self.codec), self.fps, (ancho, alto))
+                    if writer.isOpened():
+                        self.segmentos.append(ruta)
+                    else:
+                        print(f"Error: No se puede crear el vídeo {ruta} (códec {self.codec})")
+                        writer = None
+
+                if writer is None:
+                    self.fallidos += 1
+                    continue
+                writer.write(fotograma)
+                self.escritos += 1
+            except Exception as e:
+                self.fallidos += 1
+                print(f"Error de grabación en {etiqueta}: {e}")
+
+        if writer is not None:
+            writer.release()
+
+    def metricas(self):
+        """
+        Returns:
+            dict: Contadores de fotogramas recibidos, diezmados, descartados,
+                fallidos, escritos y pendientes en la cola.
+        """
+        return {"recibidos": self.recibidos, "diezmados": self.diezmados, "descartados": self.descartados,
+                "fallidos": self.fallidos, "escritos": self.escritos, "pendientes": self._cola.qsize()}
+
+    def cerrar(self, timeout=10):
+        """
+        Codifica los fotogramas pendientes y cierra el archivo en curso.
+
+        Args:
+            timeout (float): Segundos máximos de espera para el vaciado.
+        """
+        if self._hilo is None:
+            return
+        if self._hilo.is_alive():
+            try:
+                self._cola.put(None, timeout=timeout)
+            except queue.Full:
+                print("Grabación: el codificador no vacía la cola; se cierra sin esperar")
+            else:
+                self._hilo.join(timeout)
+        self._hilo = None
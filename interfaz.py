@@ -0,0 +1,599 @@
+"""
+Renderizado de la interfaz gráfica independiente de la resolución.
+
+Este módulo contiene las funciones de dibujo de la aplicación y la clase
+`Interfaz`, que compone el lienzo de cada pantalla (INICIO, JUGANDO, TERMINADO).
+Todas las posiciones se expresan como fracciones del lienzo y los tamaños
+(radios, grosores, escalas de fuente) se escalan respecto al diseño de
+referencia de 1280x720, de modo que el mismo código sirve para cualquier
+tamaño de lienzo.
+
+El perfil de renderizado (ver `Config.perfiles_render`) fija el tamaño del lienzo
+y si se dibujan las pasadas decorativas y los paneles semitransparentes.
+"""
+
+import math
+import os
+
+import cv2
+import numpy as np
+
+from config import config
+
+# Diseño de referencia: los tamaños en píxeles se expresan para este lienzo
+ANCHO_REFERENCIA, ALTO_REFERENCIA = 1280, 720
+
+MAPEO_IMAGENES = {
+    "GUERRERO_4": "guerrero 4.jpg",
+    "PERRO_BOCA_ABAJO": "perro boca abajo.jpg",
+    "PINZA_SENTADA": "pinza sentada.jpg",
+    "ARBOL": "arbol.jpg",
+    "POSE_FACIL": "pose facil.jpg",
+    "TRIANGULO_EXTENDIDO": "triangulo extendido.jpg",
+    "BARCA": "barca.jpg",
+    "SENTADILLA": "sentadilla.jpg",
+    "GUERRERO_2": "guerrero 2.jpg",
+    "PLANCHA_LATERAL": "plancha lateral.jpg",
+    "GUERRERO_3": "guerrero 3.jpg",
+    "GUERRERO_1": "guerrero 1.jpg",
+    "MESA": "gato.jpg"
+}
+
+
+def crear_fondo_gradiente(width, height, color1, color2, vertical=True):
+    """
+    Genera una imagen de fondo con un gradiente lineal suave entre dos colores.
+
+    Args:
+        width (int): Ancho de la imagen.
+        height (int): Alto de la imagen.
+        color1 (tuple): Color inicial (B, G, R).
+        color2 (tuple): Color final (B, G, R).
+        vertical (bool): True para gradiente vertical, False para horizontal.
+
+    Returns:
+        numpy.ndarray: Imagen generada con el gradiente.
+    """
+    imagen = np.zeros((height, width, 3), dtype=np.uint8)
+
+    if vertical:
+        for i in range(height):
+            ratio = i / height
+            color = tuple([int(color1[j] * (1 - ratio) + color2[j] * ratio) for j in range(3)])
+            imagen[i, :] = color
+    else:
+        for i in range(width):
+            ratio = i / width
+            color = tuple([int(color1[j] * (1 - ratio) + color2[j] * ratio) for j in range(3)])
+            imagen[:, i] = color
+
+    return imagen
+
+def dibujar_texto_con_sombra(img, text, pos, font=cv2.FONT_HERSHEY_SIMPLEX,
+                             font_scale=1, text_color=(255, 255, 255),
+                             shadow_color=(0, 0, 0), thickness=2, shadow_offset=3):
+    """
+    Dibuja texto sobre una imagen proyectando una sombra para mejorar la legibilidad.
+
+    Args:
+        img (numpy.ndarray): Imagen destino.
+        text (str): Texto a escribir.
+        pos (tuple): Coordenadas (x, y) de la esquina inferior izquierda.
+        font (int): Tipo de fuente OpenCV.
+        font_scale (float): Escala de la fuente.
+        text_color (tuple): Color del texto principal (B, G, R).
+        shadow_color (tuple): Color de la sombra.
+        thickness (int): Grosor de la línea.
+        shadow_offset (int): Desplazamiento de la sombra en píxeles.
+    """
+    x, y = pos
+    # Dibujar sombra
+    cv2.putText(img, text, (x + shadow_offset, y + shadow_offset),
+                font, font_scale, shadow_color, thickness + 1)
+    # Dibujar texto principal
+    cv2.putText(img, text, (x, y), font, font_scale, text_color, thickness)
+
+def dibujar_rectangulo_redondeado(img, p1, p2, radio, color):
+    """
+    Rellena un rectángulo con esquinas redondeadas.
+
+    Args:
+        img (numpy.ndarray): Imagen destino.
+        p1 (tuple): Esquina superior izquierda (x, y).
+        p2 (tuple): Esquina inferior derecha (x, y).
+        radio (int): Radio de las esquinas.
+        color (tuple): Color de relleno (B, G, R).
+    """
+    x1, y1 = p1
+    x2, y2 = p2
+    cv2.ellipse(img, (x1 + radio, y1 + radio), (radio, radio), 180, 0, 90, color, -1)
+    cv2.ellipse(img, (x2 - radio, y1 + radio), (radio, radio), 270, 0, 90, color, -1)
+    cv2.ellipse(img, (x1 + radio, y2 - radio), (radio, radio), 90, 0, 90, color, -1)
+    cv2.ellipse(img, (x2 - radio, y2 - radio), (radio, radio), 0, 0, 90, color, -1)
+    cv2.rectangle(img, (x1 + radio, y1), (x2 - radio, y2), color, -1)
+    cv2.rectangle(img, (x1, y1 + radio), (x2, y2 - radio), color, -1)
+
+def draw_text_with_background(img, text, pos, font=cv2.FONT_HERSHEY_SIMPLEX,
+                               font_scale=1, text_color=(255, 255, 255),
+                               bg_color=(0, 0, 0), thickness=2, padding=15, border_radius=20,
+                               transparencia=True):
+    """
+    Renderiza texto sobre un cuadro de fondo semitransparente con esquinas redondeadas.
+
+    La mezcla alfa se limita a la región del cuadro en lugar de copiar y mezclar
+    la imagen completa.
+
+    Args:
+        img (numpy.ndarray): Imagen destino.
+        text (str): Texto a mostrar.
+        pos (tuple): Posición (x, y).
+        font (int): Fuente OpenCV.
+        font_scale (float): Tamaño de fuente.
+        text_color (tuple): Color del texto.
+        bg_color (tuple): Color del fondo del recuadro.
+        thickness (int): Grosor del texto.
+        padding (int): Espaciado interno alrededor del texto.
+        border_radius (int): Radio para el efecto de esquinas redondeadas.
+        transparencia (bool): Si es False, el fondo se dibuja opaco sin mezcla alfa.
+    """
+    x, y = pos
+    text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
+
+    # Coordenadas del rectángulo contenedor
+    x1 = x - padding
+    y1 = y - text_size[1] - padding
+    x2 = x + text_size[0] + padding
+    y2 = y + padding
+
+    if transparencia:
+        # Región del cuadro recortada a los límites de la imagen
+        rx1, ry1 = max(0, x1), max(0, y1)
+        rx2, ry2 = min(img.shape[1], x2 + 1), min(img.shape[0], y2 + 1)
+        if rx2 > rx1 and ry2 > ry1:
+            region = img[ry1:ry2, rx1:rx2]
+            overlay = region.copy()
+            dibujar_rectangulo_redondeado(overlay, (x1 - rx1, y1 - ry1), (x2 - rx1, y2 - ry1),
+                                          border_radius, bg_color)
+            # Aplicar transparencia (Alpha Blending)
+            alpha = 0.8
+            img[ry1:ry2, rx1:rx2] = cv2.addWeighted(overlay, alpha, region, 1 - alpha, 0)
+    else:
+        dibujar_rectangulo_redondeado(img, (x1, y1), (x2, y2), border_radius, bg_color)
+
+    # Renderizar texto final
+    cv2.putText(img, text, (x, y), font, font_scale, text_color, thickness)
+
+def dibujar_circulo_om(img, centro, radio, color):
+    """
+    Dibuja un elemento gráfico decorativo (círculo estilizado tipo 'Om').
+
+    Args:
+        img (numpy.ndarray): Imagen destino.
+        centro (tuple): Coordenadas (x, y) del centro.
+        radio (int): Radio del círculo exterior.
+        color (tuple): Color de las líneas (B, G, R).
+    """
+    x, y = centro
+    cv2.circle(img, (x, y), radio, color, 3)
+    cv2.circle(img, (x, y), int(radio * 0.6), color, 2)
+    cv2.line(img, (x, y - radio), (x, y + radio), color, 2)
+
+
+class Interfaz:
+    """
+    Compositor de las pantallas de la aplicación para un perfil de renderizado.
+
+    Carga y escala los recursos gráficos una sola vez al crearse. Las partes
+    estáticas de las pantallas de inicio y fin también se componen una única vez,
+    y las pantallas dinámicas se dibujan sobre lienzos reservados al crearse, de
+    modo que el bucle no reserva memoria nueva en cada fotograma.
+    """
+
+    def __init__(self, perfil=None):
+        """
+        Args:
+            perfil (str): Nombre del perfil en `config.perfiles_render`. Si es None
+                se usa `config.perfil_render`.
+        """
+        self.perfil = perfil or config.perfil_render
+        ajustes = config.perfiles_render[self.perfil]
+        self.W, self.H = ajustes["lienzo"]
+        self.decoracion = ajustes["decoracion"]
+        self.transparencias = ajustes["transparencias"]
+        self.escala = min(self.W / ANCHO_REFERENCIA, self.H / ALTO_REFERENCIA)
+
+        # Región de la cámara dentro del lienzo
+        self.w_cam = int(self.W * config.proporcion_camara[0])
+        self.h_cam = int(self.H * config.proporcion_camara[1])
+        self.x_cam = self.W - self.w_cam
+        self.y_cam = self.px(config.margen_camara)
+
+        self.fondo_inicio = self._cargar_fondo_inicio()
+        self.fondo_final = self._cargar_fondo_final()
+        self.posturas_imagenes = self._cargar_posturas()
+
+        # Barra de progreso
+        self.barra_width = self.w_cam - self.px(40)
+        self.barra_alto = self.px(30)
+        self._gradiente_barra = self._crear_gradiente_barra()
+
+        self._base_inicio = self._componer_base_inicio()
+        self._base_final = self._componer_base_final()
+        self._pantalla_final = self._componer_final()
+
+        # Lienzos reutilizados por las pantallas dinámicas
+        self._lienzo_inicio = np.empty_like(self._base_inicio)
+        self._lienzo_final = np.empty_like(self._base_final)
+        self._cuenta_final = None
+        self._lienzo_juego = np.empty((self.H, self.W, 3), dtype=np.uint8)
+        self._camara_escalada = np.empty((self.h_cam, self.w_cam, 3), dtype=np.uint8)
+
+    def px(self, valor):
+        """Escala una medida en píxeles del diseño de referencia al lienzo actual."""
+        return max(1, int(round(valor * self.escala)))
+
+    def fuente(self, escala):
+        """Escala el tamaño de fuente del diseño de referencia al lienzo actual."""
+        return escala * self.escala
+
+    # --- Carga de recursos ---
+
+    def _leer_imagen(self, nombre_archivo):
+        img = cv2.imread(os.path.join(config.fotos_path, nombre_archivo))
+        if img is None:
+            return None
+        return cv2.resize(img, (self.W, self.H), interpolation=cv2.INTER_AREA)
+
+    def _cargar_fondo_inicio(self):
+        fondo = self._leer_imagen('inicio.jpg')
+        if fondo is not None:
+            print("Imagen de inicio cargada correctamente")
+            return fondo
+
+        print("No se encontró inicio.jpg, generando fondo dinámico")
+        fondo = crear_fondo_gradiente(self.W, self.H,
+                                      (140, 90, 60),    # Morado oscuro
+                                      (180, 130, 50),   # Morado claro
+                                      vertical=True)
+        # Decoración fondo inicio
+        if self.decoracion:
+            for fila in (0.15, 0.85):
+                for i in range(5):
+                    x = int(self.W * (0.2 + i * 0.15))
+                    y = int(self.H * fila)
+                    dibujar_circulo_om(fondo, (x, y), self.px(30), (180, 150, 100))
+        return fondo
+
+    def _cargar_fondo_final(self):
+        fondo = self._leer_imagen('final.jpg')
+        if fondo is not None:
+            print("Imagen final cargada correctamente")
+            return fondo
+
+        print("No se encontró final.jpg, generando fondo dinámico")
+        fondo = crear_fondo_gradiente(self.W, self.H,
+                                      (100, 180, 50),   # Verde azulado
+                                      (150, 200, 100),  # Verde claro
+                                      vertical=True)
+        # Decoración fondo final
+        if self.decoracion:
+            for fila in (0.2, 0.8):
+                for i in range(8):
+                    x = int(self.W * (0.1 + i * 0.11))
+                    y = int(self.H * fila)
+                    cv2.circle(fondo, (x, y), self.px(8), (255, 255, 150), -1)
+        return fondo
+
+    def _cargar_posturas(self):
+        """Carga las imágenes de referencia ya escaladas al tamaño del lienzo."""
+        imagenes = {}
+        for nombre_postura, nombre_archivo in MAPEO_IMAGENES.items():
+            img = self._leer_imagen(nombre_archivo)
+            if img is None:
+                print(f"Error cargando {nombre_archivo}")
+                # Fallback: color sólido si falla la imagen
+                img = np.full((self.H, self.W, 3), (200, 150, 100), dtype=np.uint8)
+            imagenes[nombre_postura] = img
+        return imagenes
+
+    def _crear_gradiente_barra(self):
+        """Precalcula el relleno en gradiente de la barra de progreso."""
+        ratio = np.arange(self.barra_width) / self.barra_width
+        if not self.decoracion:
+            ratio = np.ones_like(ratio)
+        fila = np.stack([np.zeros_like(ratio), 200 + 55 * ratio, 100 + 155 * ratio], axis=-1)
+        return np.repeat(fila[np.newaxis].astype(np.uint8), self.barra_alto, axis=0)
+
+    # --- Elementos comunes ---
+
+    def dibujar_panel(self, lienzo, p1, p2, radio, desplazamiento_sombra, alpha_sombra, alpha_panel,
+                      color_marco):
+        """
+        Dibuja un panel redondeado con sombra, fondo translúcido y marco degradado.
+
+        En perfiles sin transparencias se omiten la sombra y el fondo, y en
+        perfiles sin decoración el marco se dibuja con una sola pasada.
+
+        Args:
+            lienzo (numpy.ndarray): Imagen destino.
+            p1 (tuple): Esquina superior izquierda (x, y).
+            p2 (tuple): Esquina inferior derecha (x, y).
+            radio (int): Radio de las esquinas.
+            desplazamiento_sombra (int): Desplazamiento de la sombra en píxeles.
+            alpha_sombra (float): Opacidad de la sombra.
+            alpha_panel (float): Opacidad del fondo blanco del panel.
+            color_marco (tuple): Color del marco en su pasada más intensa (B, G, R).
+        """
+        x1, y1 = p1
+        x2, y2 = p2
+        d = desplazamiento_sombra
+
+        if self.transparencias:
+            overlay_shadow = lienzo.copy()
+            dibujar_rectangulo_redondeado(overlay_shadow, (x1 + d, y1 + d), (x2 + d, y2 + d), radio, (0, 0, 0))
+            cv2.addWeighted(overlay_shadow, alpha_sombra, lienzo, 1 - alpha_sombra, 0, lienzo)
+
+            overlay = lienzo.copy()
+            dibujar_rectangulo_redondeado(overlay, (x1, y1), (x2, y2), radio, (255, 255, 255))
+            cv2.addWeighted(overlay, alpha_panel, lienzo, 1 - alpha_panel, 0, lienzo)
+
+        # Marco decorativo con bucle
+        for i in range(6 if self.decoracion else 1):
+            opacity = 1.0 - (i * 0.15)
+            color = tuple(int(c * opacity) for c in color_marco)
+            cv2.ellipse(lienzo, (x1 + radio, y1 + radio), (radio + i, radio + i), 180, 0, 90, color, 1)
+            cv2.ellipse(lienzo, (x2 - radio, y1 + radio), (radio + i, radio + i), 270, 0, 90, color, 1)
+            cv2.ellipse(lienzo, (x1 + radio, y2 - radio), (radio + i, radio + i), 90, 0, 90, color, 1)
+            cv2.ellipse(lienzo, (x2 - radio, y2 - radio), (radio + i, radio + i), 0, 0, 90, color, 1)
+            cv2.line(lienzo, (x1 + radio, y1 - i), (x2 - radio, y1 - i), color, 1)
+            cv2.line(lienzo, (x1 + radio, y2 + i), (x2 - radio, y2 + i), color, 1)
+            cv2.line(lienzo, (x1 - i, y1 + radio), (x1 - i, y2 - radio), color, 1)
+            cv2.line(lienzo, (x2 + i, y1 + radio), (x2 + i, y2 - radio), color, 1)
+
+    def texto_con_fondo(self, lienzo, texto, pos, font_scale, thickness, padding, border_radius, **kwargs):
+        """Envoltorio de `draw_text_with_background` con medidas del diseño de referencia."""
+        draw_text_with_background(lienzo, texto, pos,
+                                  font=cv2.FONT_HERSHEY_DUPLEX,
+                                  font_scale=self.fuente(font_scale),
+                                  thickness=self.px(thickness),
+                                  padding=self.px(padding),
+                                  border_radius=self.px(border_radius),
+                                  transparencia=self.transparencias,
+                                  **kwargs)
+
+    # --- Pantallas ---
+
+    def _componer_base_inicio(self):
+        """Compone la parte estática de la pantalla de inicio."""
+        lienzo = self.fondo_inicio.copy()
+
+        # Elementos gráficos UI (Cajas decorativas y sombras)
+        x1, y1 = int(self.W * 0.1), int(self.H * 0.08)
+        x2, y2 = int(self.W * 0.9), int(self.H * 0.4)
+        self.dibujar_panel(lienzo, (x1, y1), (x2, y2), self.px(40), self.px(10), 0.3, 0.15, (255, 255, 255))
+
+        # Textos de pantalla de inicio
+        titulo = "BIENVENIDO A TU CLASE DE YOGA"
+        dibujar_texto_con_sombra(lienzo, titulo,
+                                (int(self.W * 0.18), int(self.H * 0.2)),
+                                font=cv2.FONT_HERSHEY_DUPLEX,
+                                font_scale=self.fuente(1.6),
+                                text_color=(255, 255, 255),
+                                shadow_color=(80, 50, 30),
+                                thickness=self.px(3),
+                                shadow_offset=self.px(4))
+        return lienzo
+
+    def pantalla_inicio(self, tiempo_actual):
+        """
+        Compone la pantalla de inicio con el aviso parpadeante.
+
+        Args:
+            tiempo_actual (float): Tiempo en segundos usado para el parpadeo.
+
+        Returns:
+            numpy.ndarray: Lienzo de la pantalla (se reutiliza en la siguiente llamada).
+        """
+        lienzo = self._lienzo_inicio
+        np.copyto(lienzo, self._base_inicio)
+        parpadeo = int(tiempo_actual * 2) % 2
+        if parpadeo:
+            self.texto_con_fondo(lienzo, ">>> Pulsa ESPACIO para iniciar <<<",
+                                 (int(self.W * 0.23), int(self.H * 0.3)),
+                                 font_scale=1.1, thickness=2, padding=15, border_radius=25,
+                                 text_color=(255, 255, 255),
+                                 bg_color=(0, 0, 0))
+        return lienzo
+
+    def _componer_base_final(self):
+        """Compone la parte estática de la pantalla final (panel y felicitación)."""
+        lienzo = self.fondo_final.copy()
+
+        # Configuración UI Fin del juego
+        x1, y1 = int(self.W * 0.18), int(self.H * 0.08)
+        x2, y2 = int(self.W * 0.82), int(self.H * 0.40)
+        self.dibujar_panel(lienzo, (x1, y1), (x2, y2), self.px(30), self.px(8), 0.25, 0.12, (0, 215, 255))
+        y_centro = int((y1 + y2) / 2)
+
+        # Textos de felicitación
+        mensaje = "FELICIDADES!"
+        mensaje_size = cv2.getTextSize(mensaje, cv2.FONT_HERSHEY_DUPLEX, self.fuente(2.2), self.px(4))[0]
+        x_mensaje = int((self.W - mensaje_size[0]) / 2)
+        dibujar_texto_con_sombra(lienzo, mensaje,
+                                (x_mensaje, y_centro - self.px(40)),
+                                font=cv2.FONT_HERSHEY_DUPLEX,
+                                font_scale=self.fuente(2.2),
+                                text_color=(255, 255, 255),
+                                shadow_color=(50, 100, 50),
+                                thickness=self.px(4),
+                                shadow_offset=self.px(5))
+
+        mensaje2 = "Has completado tu sesion de yoga"
+        mensaje2_size = cv2.getTextSize(mensaje2, cv2.FONT_HERSHEY_DUPLEX, self.fuente(1.1), self.px(2))[0]
+        x_mensaje2 = int((self.W - mensaje2_size[0]) / 2)
+        dibujar_texto_con_sombra(lienzo, mensaje2,
+                                (x_mensaje2, y_centro + self.px(10)),
+                                font=cv2.FONT_HERSHEY_DUPLEX,
+                                font_scale=self.fuente(1.1),
+                                text_color=(240, 240, 240),
+                                shadow_color=(40, 80, 40),
+                                thickness=self.px(2),
+                                shadow_offset=self.px(3))
+        return lienzo
+
+    def _aviso_final(self, lienzo, texto):
+        """Dibuja el aviso centrado bajo el panel de la pantalla final."""
+        y_centro = int((int(self.H * 0.08) + int(self.H * 0.40)) / 2)
+        texto_size = cv2.getTextSize(texto, cv2.FONT_HERSHEY_DUPLEX, self.fuente(0.85), self.px(2))[0]
+        x_texto = int((self.W - texto_size[0]) / 2) - self.px(7)
+        self.texto_con_fondo(lienzo, texto,
+                             (x_texto, y_centro + self.px(70)),
+                             font_scale=0.85, thickness=2, padding=12, border_radius=20,
+                             text_color=(255, 255, 255),
+                             bg_color=(80, 100, 80))
+
+    def _componer_final(self):
+        """Compone la pantalla final de la aplicación de escritorio, que es completamente estática."""
+        lienzo = self._base_final.copy()
+        self._aviso_final(lienzo, "Pulsa ESC para salir")
+        return lienzo
+
+    def pantalla_final(self, segundos_restantes=None):
+        """
+        Compone la pantalla final.
+
+        En modo kiosco o residente la aplicación vuelve sola a la pantalla de
+        inicio, así que en lugar de invitar a salir con ESC se muestra la cuenta
+        atrás. El lienzo solo se redibuja cuando cambia el segundo mostrado.
+
+        Args:
+            segundos_restantes (float): Segundos hasta volver a la pantalla de
+                inicio, o None si la sesión no se reinicia sola.
+
+        Returns:
+            numpy.ndarray: Lienzo de la pantalla final (no debe modificarse).
+        """
+        if segundos_restantes is None:
+            return self._pantalla_final
+        cuenta = math.ceil(segundos_restantes)
+        if cuenta != self._cuenta_final:
+            np.copyto(self._lienzo_final, self._base_final)
+            self._aviso_final(self._lienzo_final, f"Volviendo al inicio en {cuenta} s" if cuenta > 0
+                              else "Volviendo al inicio...")
+            self._cuenta_final = cuenta
+        return self._lienzo_final
+
+    def pantalla_juego(self, frame, nombre_postura, postura_idx, total_posturas,
+                       tiempo_mantenido, segundos_para_superar, articulaciones=None):
+        """
+        Compone la pantalla de juego: imagen de referencia, cámara y textos.
+
+        Args:
+            frame (numpy.ndarray): Fotograma de la cámara. Solo se lee, por lo que
+                puede ser una vista de memoria compartida.
+            nombre_postura (str): Postura actual.
+            postura_idx (int): Índice de la postura en la secuencia.
+            total_posturas (int): Número de posturas de la secuencia.
+            tiempo_mantenido (float): Segundos con la postura correcta, o None si
+                la postura no está alineada.
+            segundos_para_superar (float): Segundos necesarios para superar la postura.
+            articulaciones (list): Tuplas (x, y, color) con coordenadas normalizadas
+                de las articulaciones a marcar sobre la cámara ya escalada, o None
+                si el feedback ya está dibujado en `frame`.
+
+        Returns:
+            numpy.ndarray: Lienzo de la pantalla (se reutiliza en la siguiente llamada).
+        """
+        # Preparación del lienzo de juego (Imagen de referencia)
+        lienzo = self._lienzo_juego
+        np.copyto(lienzo, self.posturas_imagenes[nombre_postura])
+
+        # Composición final: Overlay de cámara sobre lienzo
+        frame_resized = cv2.resize(frame, (self.w_cam, self.h_cam), dst=self._camara_escalada)
+        x_cam, y_cam = self.x_cam, self.y_cam
+
+        if articulaciones:
+            radio = max(1, int(15 * self.w_cam / frame.shape[1]))
+            for x, y, color in articulaciones:
+                centro = (int(x * self.w_cam), int(y * self.h_cam))
+                cv2.circle(frame_resized, centro, radio, color, -1)
+                cv2.circle(frame_resized, centro, radio, (255, 255, 255), 2)
+
+        # Marcos decorativos de la cámara
+        borde = self.px(8)
+        cv2.rectangle(lienzo,
+                     (x_cam - borde, y_cam - borde),
+                     (x_cam + self.w_cam + borde, y_cam + self.h_cam + borde),
+                     (255, 255, 255), borde)
+        if self.decoracion:
+            borde_interior = self.px(3)
+            cv2.rectangle(lienzo,
+                         (x_cam - borde_interior, y_cam - borde_interior),
+                         (x_cam + self.w_cam + borde_interior, y_cam + self.h_cam + borde_interior),
+                         (200, 200, 255), borde_interior)
+
+        lienzo[y_cam:y_cam + self.h_cam, x_cam:x_cam + self.w_cam] = frame_resized
+
+        # UI: Información de postura
+        self.texto_con_fondo(lienzo, nombre_postura.replace("_", " "),
+                             (self.px(30), int(self.H * 0.083)),
+                             font_scale=1.3, thickness=3, padding=15, border_radius=20,
+                             text_color=(255, 255, 100),
+                             bg_color=(0, 0, 0))
+
+        postura_info = f"Postura {postura_idx + 1}/{total_posturas}"
+        self.texto_con_fondo(lienzo, postura_info,
+                             (self.px(30), int(self.H * 0.153)),
+                             font_scale=0.8, thickness=2, padding=10, border_radius=15,
+                             text_color=(200, 255, 200),
+                             bg_color=(0, 0, 0))
+
+        self.texto_con_fondo(lienzo, "Presiona ENTER para saltar",
+                             (self.px(30), int(self.H * 0.306)),
+                             font_scale=0.6, thickness=2, padding=10, border_radius=15,
+                             text_color=(255, 255, 255),
+                             bg_color=(50, 50, 50))
+
+        # Feedback de alineación
+        if tiempo_mantenido is not None:
+            self.dibujar_barra_progreso(lienzo, tiempo_mantenido, segundos_para_superar)
+        else:
+            self.texto_con_fondo(lienzo, "Alinea tu cuerpo con la postura",
+                                 (self.px(30), int(self.H * 0.222)),
+                                 font_scale=0.9, thickness=2, padding=10, border_radius=15,
+                                 text_color=(255, 200, 100),
+                                 bg_color=(0, 0, 0))
+        return lienzo
+
+    def dibujar_barra_progreso(self, lienzo, tiempo_mantenido, segundos_para_superar):
+        """
+        Dibuja la barra de progreso del tiempo mantenido sobre la región de la cámara.
+
+        Args:
+            lienzo (numpy.ndarray): Imagen destino.
+            tiempo_mantenido (float): Segundos con la postura correcta.
+            segundos_para_superar (float): Segundos necesarios para superar la postura.
+        """
+        barra_width = self.barra_width
+        progreso = int((tiempo_mantenido / segundos_para_superar) * barra_width)
+        progreso = min(progreso, barra_width)
+
+        x_barra = self.x_cam + self.px(20)
+        y_barra = self.y_cam + self.h_cam - self.px(50)
+        alto = self.barra_alto
+
+        cv2.rectangle(lienzo, (x_barra - self.px(3), y_barra - self.px(3)),
+                    (x_barra + barra_width + self.px(3), y_barra + alto + self.px(3)),
+                    (255, 255, 255), self.px(2))
+        cv2.rectangle(lienzo, (x_barra, y_barra),
+                    (x_barra + barra_width, y_barra + alto),
+                    (30, 30, 30), -1)
+
+        # Relleno de barra con gradiente precalculado
+        if progreso > 0:
+            lienzo[y_barra:y_barra + alto, x_barra:x_barra + progreso] = self._gradiente_barra[:, :progreso]
+
+        tiempo_texto = f"Bien! Manten: {int(tiempo_mantenido)+1}s / {segundos_para_superar}s"
+        cv2.putText(lienzo, tiempo_texto,
+                   (x_barra + self.px(10), y_barra + self.px(20)),
+                   cv2.FONT_HERSHEY_DUPLEX, self.fuente(0.6), (255, 255, 255), self.px(2))
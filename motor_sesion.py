@@ -0,0 +1,195 @@
+"""
+Motor de la sesión de yoga (máquina de estados del juego).
+
+Este módulo define `MotorSesion`, que contiene la lógica de la sesión separada
+del bucle de vídeo: los estados INICIO -> JUGANDO -> TERMINADO, el temporizador
+que exige mantener la postura correcta durante `segundos_para_superar` y el
+salto de postura con ENTER. En modo kiosco, la pantalla final vuelve sola a la
+de inicio tras unos segundos.
+
+El motor no lee la cámara, no usa el modelo ni dibuja nada: recibe el veredicto
+de cada fotograma y las teclas pulsadas, y obtiene el tiempo de un reloj
+inyectable. Así puede ejecutarse en el bucle de la aplicación con `time.time` o
+en el simulador con un `RelojSimulado` que avanza a golpe de fotograma.
+"""
+
+import time
+
+TECLA_ESC = 27
+TECLA_ESPACIO = 32
+TECLA_ENTER = 13
+
+
+class RelojSimulado:
+    """
+    Reloj manual para simulaciones deterministas.
+
+    Se llama como `time.time` y solo avanza cuando se invoca `avanzar`.
+    """
+
+    def __init__(self, inicio=0.0):
+        self.t = inicio
+
+    def __call__(self):
+        return self.t
+
+    def avanzar(self, segundos):
+        self.t += segundos
+
+
+class MotorSesion:
+    """
+    Máquina de estados de una sesión con reloj y registro inyectables.
+
+    Atributos públicos:
+        estado (str): 'INICIO', 'JUGANDO' o 'TERMINADO'.
+        postura_idx (int): Índice de la postura actual en la secuencia.
+        sesion_id (str): Identificador de la sesión en el registro, o None.
+        resultados (list): Tuplas (postura, resultado, inicio, fin) de la sesión
+            en curso, con resultado 'superada' o 'saltada'.
+        sesiones (int): Sesiones comenzadas desde que se creó el motor.
+    """
+
+    def __init__(self, lista_posturas, segundos_para_superar, reloj=time.time, registro=None,
+                 segundos_en_final=None):
+        """
+        Args:
+            lista_posturas (list): Secuencia de nombres de `POSTURAS_YOGA`.
+            segundos_para_superar (float): Tiempo que hay que mantener la postura.
+            reloj (callable): Función que devuelve el tiempo actual en segundos.
+            registro (RegistroSesiones): Registro de analíticas, o None.
+            segundos_en_final (float): Segundos que se muestra la pantalla final
+                antes de volver a INICIO (modo kiosco), o None para quedarse en ella.
+        """
+        self.lista_posturas = lista_posturas
+        self.segundos_para_superar = segundos_para_superar
+        self.reloj = reloj
+        self.registro = registro
+        self.segundos_en_final = segundos_en_final
+        self.sesiones = 0
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vuelve a la pantalla de inicio descartando el progreso de la sesión."""
+        self.estado = "INICIO"
+        self.postura_idx = 0
+        self.postura_tiempo_inicio = None
+        self.postura_mostrada_en = None
+        self.sesion_id = None
+        self.terminado_en = None
+        self.resultados = []
+
+    @property
+    def postura_actual(self):
+        """Nombre de la postura actual, o None fuera del estado JUGANDO."""
+        if self.estado != "JUGANDO":
+            return None
+        return self.lista_posturas[self.postura_idx]
+
+    def iniciar(self):
+        """Comienza una sesión desde la pantalla de inicio."""
+        if self.estado != "INICIO":
+            return
+        ahora = self.reloj()
+        self.estado = "JUGANDO"
+        self.postura_idx = 0
+        self.postura_tiempo_inicio = None
+        self.postura_mostrada_en = ahora
+        self.resultados = []
+        self.sesiones += 1
+        if self.registro is not None:
+            self.sesion_id = self.registro.iniciar_sesion(ahora)
+
+    def _terminar_postura(self, resultado):
+        ahora = self.reloj()
+        nombre_postura = self.lista_posturas[self.postura_idx]
+        self.resultados.append((nombre_postura, resultado, self.postura_mostrada_en, ahora))
+        if self.registro is not None:
+            self.registro.registrar_postura(self.sesion_id, nombre_postura, self.postura_idx,
+                                            resultado, self.postura_mostrada_en, ahora)
+
+        self.postura_mostrada_en = ahora
+        self.postura_idx += 1
+        self.postura_tiempo_inicio = None
+        if self.postura_idx >= len(self.lista_posturas):
+            self.estado = "TERMINADO"
+            self.terminado_en = ahora
+            if self.registro is not None:
+                self.registro.finalizar_sesion(self.sesion_id, "completada", ahora)
+
+    def saltar(self):
+        """Salta la postura actual (tecla ENTER)."""
+        if self.estado == "JUGANDO":
+            self._terminar_postura("saltada")
+
+    def abandonar(self):
+        """Registra el abandono de una sesión en curso (por ejemplo, al pulsar ESC)."""
+        if self.estado == "JUGANDO" and self.registro is not None:
+            self.registro.finalizar_sesion(self.sesion_id, "abandonada", self.reloj())
+
+    def segundos_hasta_reinicio(self):
+        """
+        Returns:
+            float: Segundos que faltan para volver a INICIO desde la pantalla
+                final en modo kiosco, o None si la sesión no se reinicia sola.
+        """
+        if self.estado != "TERMINADO" or self.segundos_en_final is None:
+            return None
+        return max(0.0, self.segundos_en_final - (self.reloj() - self.terminado_en))
+
+    def comprobar_reinicio(self):
+        """
+        En modo kiosco, vuelve a INICIO cuando la pantalla final ha estado visible
+        `segundos_en_final` segundos.
+
+        Returns:
+            bool: True si se ha vuelto a la pantalla de inicio.
+        """
+        if (self.estado == "TERMINADO" and self.segundos_en_final is not None
+                and self.reloj() - self.terminado_en >= self.segundos_en_final):
+            self.reiniciar()
+            return True
+        return False
+
+    def tecla(self, key):
+        """
+        Procesa una tecla pulsada.
+
+        Args:
+            key (int): Código devuelto por `cv2.waitKey(...) & 0xFF`.
+        """
+        if self.estado == "INICIO" and key == TECLA_ESPACIO:
+            self.iniciar()
+        elif self.estado == "JUGANDO" and key == TECLA_ENTER:
+            print(f"Saltando postura: {self.postura_actual}")
+            self.saltar()
+
+    def actualizar(self, todo_correcto):
+        """
+        Avanza el temporizador de la postura con el veredicto de un fotograma.
+
+        Si la postura se mantiene correcta más de `segundos_para_superar`, se
+        pasa a la siguiente (o a TERMINADO tras la última).
+
+        Args:
+            todo_correcto (bool): Si todos los ángulos están dentro de la tolerancia.
+
+        Returns:
+            float: Segundos que lleva mantenida la postura, o None si no es correcta.
+        """
+        if self.estado != "JUGANDO":
+            return None
+
+        if not todo_correcto:
+            self.postura_tiempo_inicio = None
+            return None
+
+        ahora = self.reloj()
+        if self.postura_tiempo_inicio is None:
+            self.postura_tiempo_inicio = ahora
+        tiempo_mantenido = ahora - self.postura_tiempo_inicio
+
+        # Cambio de postura si se cumple el tiempo
+        if tiempo_mantenido > self.segundos_para_superar:
+            self._terminar_postura("superada")
+        return tiempo_mantenido
@@ -0,0 +1,531 @@
+"""
+Modo multiproceso: captura, inferencia e interfaz en procesos separados.
+
+La captura y la inferencia de MediaPipe se ejecutan en procesos propios para no
+competir por el GIL con el dibujado de la interfaz:
+
+    - El proceso de captura escribe los fotogramas (ya en espejo) en un anillo de
+      memoria compartida (`multiprocessing.shared_memory`) con números de secuencia.
+    - El proceso de inferencia toma el fotograma más reciente, ejecuta
+      `detect_for_video`, evalúa la postura activa y publica el resultado en un
+      segundo anillo.
+    - El proceso principal lee el último fotograma y el último resultado sin
+      copiarlos y compone la interfaz.
+
+Cada ranura del anillo lleva una cabecera con su número de secuencia que el
+escritor invalida antes de sobrescribirla (patrón seqlock). El lector comprueba
+la cabecera después de usar los datos y descarta el fotograma si ha sido
+sobrescrito mientras tanto. Un supervisor reinicia los procesos que terminen
+de forma inesperada.
+
+Uso:
+    python multiproceso.py [fuente] [--perfil NOMBRE]
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from config import config
+from ajuste_hilos import aplicar_perfil, cargar_perfil, delegado
+from angulos import ANGULO_LANDMARKS_MAP
+from posturas import POSTURAS_YOGA, LISTA_POSTURAS
+from evaluacion import COLOR_CORRECTO, COLOR_INCORRECTO, angulos_lote, nombres_angulos, veredictos_lote
+from motor_sesion import MotorSesion, TECLA_ESC
+from ritmo import RitmoFotogramas
+
+# Orden fijo de los ángulos en los resultados publicados
+NOMBRES_ANGULOS = list(ANGULO_LANDMARKS_MAP)
+
+DTYPE_CABECERA = np.dtype([("seq", "i8"), ("t", "f8")])
+
+DTYPE_RESULTADO = np.dtype([
+    ("frame_seq", "i8"),
+    ("postura_idx", "i4"),
+    ("hay_persona", "?"),
+    ("todo_correcto", "?"),
+    ("landmarks", "f4", (33, 3)),
+    ("angulos", "f4", (len(NOMBRES_ANGULOS),)),
+    ("estado_articulacion", "i1", (33,)),
+])
+
+# Las cabeceras empiezan tras un bloque de control alineado a línea de caché
+TAM_CONTROL = 64
+
+
+class AnilloCompartido:
+    """
+    Anillo de ranuras de tamaño fijo en memoria compartida con un único escritor.
+
+    El número de secuencia publicado más reciente se guarda en el bloque de
+    control; la ranura de la secuencia `seq` es `seq % ranuras`.
+    """
+
+    def __init__(self, forma, dtype, ranuras=4, nombre=None):
+        """
+        Args:
+            forma (tuple): Forma de los datos de cada ranura.
+            dtype (numpy.dtype): Tipo de los datos de cada ranura.
+            ranuras (int): Número de ranuras del anillo.
+            nombre (str): Nombre de un bloque existente al que conectarse, o None
+                para crear uno nuevo.
+        """
+        self.forma = tuple(forma)
+        self.dtype = np.dtype(dtype)
+        self.ranuras = ranuras
+        self.creador = nombre is None
+
+        tam_cabeceras = ranuras * DTYPE_CABECERA.itemsize
+        tam_datos = ranuras * int(np.prod(self.forma, dtype=np.int64)) * self.dtype.itemsize
+        if self.creador:
+            self.shm = shared_memory.SharedMemory(create=True, size=TAM_CONTROL + tam_cabeceras + tam_datos)
+        else:
+            # Los procesos hijos comparten el resource_tracker del creador, que es
+            # el único que elimina el bloque en `cerrar`
+            self.shm = shared_memory.SharedMemory(name=nombre)
+
+        self.control = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf)
+        self.cabeceras = np.ndarray((ranuras,), dtype=DTYPE_CABECERA, buffer=self.shm.buf, offset=TAM_CONTROL)
+        self.datos = np.ndarray((ranuras,) + self.forma, dtype=self.dtype, buffer=self.shm.buf,
+                                offset=TAM_CONTROL + tam_cabeceras)
+        if self.creador:
+            self.control[0] = -1
+            self.cabeceras["seq"] = -1
+
+    def descriptor(self):
+        """Argumentos para reconstruir el anillo en otro proceso con `AnilloCompartido(*descriptor)`."""
+        return self.forma, self.dtype, self.ranuras, self.shm.name
+
+    # --- Escritor ---
+
+    def comenzar_escritura(self):
+        """
+        Reserva la siguiente ranura para escribir.
+
+        La cabecera de la ranura se invalida antes de devolverla, de modo que un
+        lector que la esté usando detecte la sobrescritura.
+
+        Returns:
+            tuple: (seq, vista) con la vista de la ranura para escribir en ella.
+        """
+        seq = int(self.control[0]) + 1
+        ranura = seq % self.ranuras
+        self.cabeceras["seq"][ranura] = -1
+        return seq, self.datos[ranura]
+
+    def publicar(self, seq, t):
+        """
+        Publica una ranura escrita.
+
+        Args:
+            seq (int): Secuencia devuelta por `comenzar_escritura`.
+            t (float): Instante de captura (`time.perf_counter`) asociado.
+        """
+        ranura = seq % self.ranuras
+        self.cabeceras["t"][ranura] = t
+        self.cabeceras["seq"][ranura] = seq
+        self.control[0] = seq
+
+    # --- Lectores ---
+
+    def ultimo(self):
+        """Devuelve la secuencia publicada más reciente, o -1 si no hay ninguna."""
+        return int(self.control[0])
+
+    def leer(self, seq):
+        """
+        Devuelve una vista sin copia de la ranura de `seq`.
+
+        La vista solo es válida mientras `vigente(seq)` sea True; hay que
+        comprobarlo después de usarla.
+
+        Returns:
+            numpy.ndarray: Vista de los datos, o None si ya fue sobrescrita.
+        """
+        ranura = seq % self.ranuras
+        if seq < 0 or self.cabeceras["seq"][ranura] != seq:
+            return None
+        return self.datos[ranura]
+
+    def vigente(self, seq):
+        """Indica si la ranura de `seq` no ha sido invalidada ni sobrescrita."""
+        return seq >= 0 and self.cabeceras["seq"][seq % self.ranuras] == seq
+
+    def copiar(self, seq):
+        """
+        Copia los datos de `seq` validando que no se sobrescriben durante la copia.
+
+        Returns:
+            numpy.ndarray: Copia de los datos, o None si la ranura fue sobrescrita.
+        """
+        ranura = seq % self.ranuras
+        if not self.vigente(seq):
+            return None
+        copia = self.datos[ranura:ranura + 1].copy()[0]
+        return copia if self.vigente(seq) else None
+
+    def instante(self, seq):
+        """Instante de captura asociado a `seq`."""
+        return float(self.cabeceras["t"][seq % self.ranuras])
+
+    def cerrar(self):
+        """Libera la vista local y, en el proceso creador, elimina el bloque."""
+        del self.control, self.cabeceras, self.datos
+        self.shm.close()
+        if self.creador:
+            self.shm.unlink()
+
+
+# --- Procesos de trabajo ---
+
+def proceso_captura(desc_fotogramas, fuente, capturar, parar, perfil=None):
+    """
+    Lee la cámara y publica los fotogramas en espejo en el anillo compartido.
+
+    Los fotogramas se escalan a la forma del anillo si el driver negocia otra
+    resolución. Mientras `capturar` sea 0 no se leen fotogramas.
+    """
+    from camara import camara_desde_config
+
+    aplicar_perfil(perfil, "captura")
+
+    anillo = AnilloCompartido(*desc_fotogramas)
+    alto, ancho = anillo.forma[:2]
+    camara = camara_desde_config(config, fuente)
+    if not camara.abrir():
+        print("Error: No se puede abrir la cámara.")
+        sys.exit(1)
+
+    suspendida = False
+    while not parar.is_set():
+        if not capturar.value:
+            suspendida = True
+            time.sleep(0.05)
+            continue
+        if suspendida:
+            camara.drenar()
+            suspendida = False
+
+        ret, frame = camara.read()
+        if not ret:
+            print("Error al leer frame.")
+            sys.exit(1)
+
+        if frame.shape[:2] != (alto, ancho):
+            frame = cv2.resize(frame, (ancho, alto))
+        seq, destino = anillo.comenzar_escritura()
+        # Efecto espejo escrito directamente en la ranura
+        cv2.flip(frame, 1, dst=destino)
+        anillo.publicar(seq, camara.t_captura)
+
+    camara.release()
+
+
+def proceso_inferencia(desc_fotogramas, desc_resultados, postura_idx, parar, perfil=None):
+    """
+    Ejecuta MediaPipe sobre el fotograma más reciente y publica landmarks y veredicto.
+
+    La postura evaluada es la indicada en `postura_idx` (-1 si no hay sesión en
+    curso, en cuyo caso solo se publican los landmarks).
+    """
+    import mediapipe as mp
+
+    # La afinidad se fija antes de crear el landmarker para que sus hilos la hereden
+    aplicar_perfil(perfil, "inferencia")
+
+    fotogramas = AnilloCompartido(*desc_fotogramas)
+    resultados = AnilloCompartido(*desc_resultados)
+
+    options = mp.tasks.vision.PoseLandmarkerOptions(
+        base_options=mp.tasks.BaseOptions(model_asset_path=config.model_path, delegate=delegado(perfil)),
+        running_mode=mp.tasks.vision.RunningMode.VIDEO,
+        num_poses=1
+    )
+
+    with mp.tasks.vision.PoseLandmarker.create_from_options(options) as landmarker:
+        procesado = -1
+        timestamp = 0
+        origen = time.perf_counter()
+        while not parar.is_set():
+            seq = fotogramas.ultimo()
+            if seq == procesado or seq < 0:
+                time.sleep(0.001)
+                continue
+
+            vista = fotogramas.leer(seq)
+            if vista is None:
+                continue
+            # La conversión a RGB (el modelo no acepta BGR) copia los píxeles; si la
+            # ranura cambió durante la copia se descarta
+            rgb = cv2.cvtColor(vista, cv2.COLOR_BGR2RGB)
+            t_captura = fotogramas.instante(seq)
+            if not fotogramas.vigente(seq):
+                continue
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+            procesado = seq
+
+            idx = postura_idx.value
+            timestamp = max(timestamp + 1, int((time.perf_counter() - origen) * 1000))
+            result = landmarker.detect_for_video(mp_image, timestamp)
+
+            rseq, r = resultados.comenzar_escritura()
+            r["frame_seq"] = seq
+            r["postura_idx"] = idx
+            r["hay_persona"] = bool(result.pose_landmarks)
+            r["todo_correcto"] = False
+            r["angulos"] = np.nan
+            r["estado_articulacion"] = -1
+
+            if result.pose_landmarks:
+                landmarks = np.array([[lm.x, lm.y, lm.visibility] for lm in result.pose_landmarks[0]],
+                                     dtype=np.float32)
+                r["landmarks"] = landmarks
+                if idx >= 0:
+                    definicion = POSTURAS_YOGA[LISTA_POSTURAS[idx]]
+                    nombres = nombres_angulos(definicion)
+                    angulos = angulos_lote(landmarks[np.newaxis], nombres)
+                    _, correctos, todo = veredictos_lote(angulos, definicion, nombres)
+                    r["todo_correcto"] = bool(todo[0])
+                    for k, nombre in enumerate(nombres):
+                        r["angulos"][NOMBRES_ANGULOS.index(nombre)] = angulos[0, k]
+                        r["estado_articulacion"][ANGULO_LANDMARKS_MAP[nombre][1]] = int(correctos[0, k])
+            resultados.publicar(rseq, t_captura)
+
+
+class Supervisor:
+    """
+    Arranca procesos de trabajo y los reinicia si terminan inesperadamente.
+    """
+
+    def __init__(self, parar, espera_reinicio=1.0):
+        """
+        Args:
+            parar (multiprocessing.Event): Señal de parada compartida con los procesos.
+            espera_reinicio (float): Segundos mínimos entre dos arranques del mismo
+                proceso, para no reiniciar en bucle una cámara que no abre.
+        """
+        self.parar = parar
+        self.espera_reinicio = espera_reinicio
+        self.procesos = {}
+        self.reinicios = {}
+        self._arranques = {}
+
+    def lanzar(self, nombre, target, args):
+        """Arranca (o vuelve a arrancar) un proceso de trabajo con nombre."""
+        proceso = multiprocessing.Process(target=target, args=args, name=nombre, daemon=True)
+        proceso.start()
+        self.procesos[nombre] = (proceso, target, args)
+        self._arranques[nombre] = time.monotonic()
+        self.reinicios.setdefault(nombre, 0)
+
+    def vigilar(self):
+        """Reinicia los procesos caídos. Debe llamarse periódicamente."""
+        if self.parar.is_set():
+            return
+        for nombre, (proceso, target, args) in list(self.procesos.items()):
+            if not proceso.is_alive():
+                if time.monotonic() - self._arranques[nombre] < self.espera_reinicio:
+                    continue
+                proceso.join()
+                self.reinicios[nombre] += 1
+                print(f"Proceso {nombre} terminado (código {proceso.exitcode}); reiniciando")
+                self.lanzar(nombre, target, args)
+
+    def detener(self, timeout=5):
+        """Pide a los procesos que terminen y los finaliza si no lo hacen a tiempo."""
+        self.parar.set()
+        for proceso, _, _ in self.procesos.values():
+            proceso.join(timeout)
+            if proceso.is_alive():
+                proceso.terminate()
+
+
+class PipelineMultiproceso:
+    """
+    Anillos compartidos y procesos de captura e inferencia.
+
+    Se usa como gestor de contexto: al salir detiene los procesos y libera la
+    memoria compartida.
+    """
+
+    def __init__(self, fuente=None, ranuras=None, perfil=None):
+        """
+        Args:
+            fuente (int | str): Cámara o vídeo, o None para la de config.py.
+            ranuras (int): Ranuras de cada anillo, o None para la de config.py.
+            perfil (dict): Perfil de hilos y afinidad que aplica cada proceso.
+        """
+        ancho, alto = config.camara_resolucion
+        ranuras = ranuras or config.multiproceso_ranuras
+        self.fotogramas = AnilloCompartido((alto, ancho, 3), np.uint8, ranuras)
+        self.resultados = AnilloCompartido((), DTYPE_RESULTADO, ranuras)
+
+        self.capturar = multiprocessing.Value("b", 1, lock=False)
+        self.postura_idx = multiprocessing.Value("i", -1, lock=False)
+        self.parar = multiprocessing.Event()
+        self.supervisor = Supervisor(self.parar)
+        self.supervisor.lanzar("captura", proceso_captura,
+                               (self.fotogramas.descriptor(), fuente, self.capturar, self.parar, perfil))
+        self.supervisor.lanzar("inferencia", proceso_inferencia,
+                               (self.fotogramas.descriptor(), self.resultados.descriptor(),
+                                self.postura_idx, self.parar, perfil))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.supervisor.detener()
+        self.fotogramas.cerrar()
+        self.resultados.cerrar()
+
+
+def articulaciones_resultado(resultado):
+    """
+    Convierte un resultado publicado en la lista de articulaciones a marcar.
+
+    Returns:
+        list: Tuplas (x, y, color) con coordenadas normalizadas.
+    """
+    articulaciones = []
+    for idx in np.flatnonzero(resultado["estado_articulacion"] >= 0):
+        x, y, _ = resultado["landmarks"][idx]
+        color = COLOR_CORRECTO if resultado["estado_articulacion"][idx] else COLOR_INCORRECTO
+        articulaciones.append((float(x), float(y), color))
+    return articulaciones
+
+
+def bucle_ui(pipeline, interfaz, motor, registro=None, mostrar=True, duracion=None):
+    """
+    Bucle de interfaz del modo multiproceso.
+
+    Args:
+        pipeline (PipelineMultiproceso): Anillos y procesos en marcha.
+        interfaz (Interfaz): Compositor de pantallas.
+        motor (MotorSesion): Lógica de la sesión.
+        registro (RegistroSesiones): Registro de analíticas, o None.
+        mostrar (bool): Mostrar la ventana y leer el teclado.
+        duracion (float): Segundos tras los que terminar, o None para esperar a ESC.
+
+    Returns:
+        dict: Fotogramas mostrados, descartados por sobrescritura, resultados
+            nuevos, latencias medias (ms) y reinicios de procesos.
+    """
+    ritmo = RitmoFotogramas(config.fps_objetivo)
+    fotogramas, resultados = pipeline.fotogramas, pipeline.resultados
+    metricas = {"mostrados": 0, "sobrescritos": 0, "resultados": 0,
+                "latencia_fotograma_ms": 0.0, "latencia_resultado_ms": 0.0}
+    ultimo_resultado = -1
+    # Fotograma y postura del último lienzo compuesto en juego
+    mostrado = None
+    lienzo = None
+    fin = None if duracion is None else time.perf_counter() + duracion
+
+    while fin is None or time.perf_counter() < fin:
+        pipeline.supervisor.vigilar()
+        reposo = RitmoFotogramas.es_reposo(motor.estado)
+        pipeline.capturar.value = 0 if (config.suspender_camara_en_reposo and reposo) else 1
+        pipeline.postura_idx.value = motor.postura_idx if motor.estado == "JUGANDO" else -1
+
+        if motor.estado == "INICIO":
+            lienzo = interfaz.pantalla_inicio(time.time())
+            mostrado = None
+
+        elif motor.estado == "TERMINADO":
+            lienzo = interfaz.pantalla_final(motor.segundos_hasta_reinicio())
+            mostrado = None
+
+        elif motor.estado == "JUGANDO":
+            nombre_postura = motor.postura_actual
+            postura_idx = motor.postura_idx
+
+            # Último resultado de inferencia evaluado sobre la postura actual
+            rseq = resultados.ultimo()
+            resultado = resultados.copiar(rseq) if rseq >= 0 else None
+            if resultado is not None and resultado["postura_idx"] != postura_idx:
+                resultado = None
+
+            todo_correcto = resultado is not None and bool(resultado["todo_correcto"])
+            if resultado is not None and rseq != ultimo_resultado:
+                ultimo_resultado = rseq
+                metricas["resultados"] += 1
+                metricas["latencia_resultado_ms"] += 1000 * (time.perf_counter() - resultados.instante(rseq))
+                if registro is not None and resultado["hay_persona"]:
+                    definicion = POSTURAS_YOGA[nombre_postura]
+                    angulos = {}
+                    for nombre in nombres_angulos(definicion):
+                        valor = float(resultado["angulos"][NOMBRES_ANGULOS.index(nombre)])
+                        angulos[nombre] = (None, None) if np.isnan(valor) else \
+                            (valor, abs(valor - definicion[nombre]))
+                    registro.registrar_angulos(motor.sesion_id, nombre_postura, time.time(), angulos)
+
+            tiempo_mantenido = motor.actualizar(todo_correcto)
+
+            fseq = fotogramas.ultimo()
+            # Sin fotograma nuevo no se recompone: la ventana conserva el lienzo anterior
+            vista = fotogramas.leer(fseq) if (fseq, postura_idx) != mostrado else None
+            if vista is None:
+                lienzo = None
+            else:
+                articulaciones = articulaciones_resultado(resultado) if resultado is not None else None
+                nuevo = interfaz.pantalla_juego(vista, nombre_postura, postura_idx, len(LISTA_POSTURAS),
+                                                tiempo_mantenido, config.segundos_para_superar,
+                                                articulaciones=articulaciones)
+                # La ranura pudo sobrescribirse mientras se escalaba: se descarta el lienzo
+                if fotogramas.vigente(fseq):
+                    lienzo = nuevo
+                    mostrado = (fseq, postura_idx)
+                    metricas["latencia_fotograma_ms"] += 1000 * (time.perf_counter() - fotogramas.instante(fseq))
+                    metricas["mostrados"] += 1
+                else:
+                    # El lienzo reutilizado contiene la composición descartada: la
+                    # ventana conserva la última imagen válida
+                    lienzo = None
+                    metricas["sobrescritos"] += 1
+
+        key = 0xFF
+        if mostrar:
+            if lienzo is not None:
+                cv2.imshow("Profesor de Yoga - IPM", lienzo)
+            key = cv2.waitKey(ritmo.espera_ms(motor.estado)) & 0xFF
+        else:
+            time.sleep(ritmo.espera_ms(motor.estado) / 1000)
+
+        if key == TECLA_ESC:
+            break
+        motor.tecla(key)
+
+    if metricas["mostrados"]:
+        metricas["latencia_fotograma_ms"] /= metricas["mostrados"]
+    if metricas["resultados"]:
+        metricas["latencia_resultado_ms"] /= metricas["resultados"]
+    metricas["reinicios"] = dict(pipeline.supervisor.reinicios)
+    return metricas
+
+
+if __name__ == "__main__":
+    from interfaz import Interfaz
+    from registro_sesiones import RegistroSesiones
+
+    parser = argparse.ArgumentParser(description="Profesor de Yoga - IPM (modo multiproceso)")
+    parser.add_argument("fuente", nargs="?", default=None,
+                        help="Índice de cámara o archivo de vídeo (por defecto, el de config.py)")
+    parser.add_argument("--perfil", choices=sorted(config.perfiles_render), default=config.perfil_render,
+                        help="Perfil de renderizado")
+    args = parser.parse_args()
+
+    perfil_hilos = cargar_perfil() if config.aplicar_perfil_hilos else None
+    aplicar_perfil(perfil_hilos, "interfaz")
+
+    interfaz = Interfaz(args.perfil)
+    with RegistroSesiones(config.ruta_sesiones, activo=config.registrar_sesiones) as registro, \
+            PipelineMultiproceso(args.fuente, perfil=perfil_hilos) as pipeline:
+        motor = MotorSesion(LISTA_POSTURAS, config.segundos_para_superar, registro=registro)
+        metricas = bucle_ui(pipeline, interfaz, motor, registro)
+        motor.abandonar()
+    cv2.destroyAllWindows()
+    print(f"Métricas: {metricas}")
@@ -12,6 +12,9 @@ Estructura de datos:
         - Valores de ángulo (int): Grados objetivo esperados (0-180).
         - "tolerancia" (int): Margen de error aceptable en grados (+/-) para considerar
           la postura como correcta.
+
+También define `LISTA_POSTURAS`, el orden en que se presentan las posturas durante
+una sesión.
 """
 
 POSTURAS_YOGA = {
@@ -155,4 +158,21 @@ POSTURAS_YOGA = {
         "angulo_rodilla_izq": 90,
         "tolerancia": 40
     }
-}
\ No newline at end of file
+}
+
+# Secuencia de posturas de una sesión
+LISTA_POSTURAS = [
+    "POSE_FACIL",
+    "MESA",
+    "PERRO_BOCA_ABAJO",
+    "PINZA_SENTADA",
+    "SENTADILLA",
+    "PLANCHA_LATERAL",
+    "ARBOL",
+    "GUERRERO_1",
+    "GUERRERO_2",
+    "GUERRERO_3",
+    "GUERRERO_4",
+    "TRIANGULO_EXTENDIDO",
+    "BARCA"
+]
\ No newline at end of file
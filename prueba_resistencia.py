@@ -0,0 +1,127 @@
+"""
+Prueba de resistencia del modo kiosco.
+
+Reproduce en bucle un vídeo grabado durante horas con el mismo bucle que
+`app.py --kiosco` (`app.ejecutar`), sin ventana y sin límite de FPS en juego,
+encadenando sesiones: la sesión se inicia sola, cada postura se salta si no se
+supera en unos segundos y la pantalla final vuelve a la de inicio. El modelo, la
+cámara y los recursos se crean una sola vez.
+
+Cada `--intervalo` segundos se muestra una muestra de telemetría (FPS, tiempo
+por fotograma, RSS y asignaciones que más crecen). Solo se cuentan los
+fotogramas de juego, y los FPS que se vigilan son los sostenibles según el
+tiempo de trabajo, para que no dependan de las pantallas de reposo. Al terminar
+se comparan las primeras muestras con las últimas y el proceso sale con código 1
+si la memoria ha crecido o los FPS han caído más de lo permitido.
+
+Uso:
+    python prueba_resistencia.py VIDEO [--horas H] [--intervalo S]
+        [--max-crecimiento-mb MB] [--max-caida-fps FRACCION] [--perfil NOMBRE]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from config import config
+from app import PoseLandmarker, ejecutar, opciones_landmarker
+from camara import camara_desde_config
+from interfaz import Interfaz
+from registro_sesiones import RegistroSesiones
+from telemetria import Telemetria, deriva
+
+
+def ejecutar_prueba(fuente, interfaz, segundos, telemetria, registro, segundos_postura=5, segundos_inicio=1):
+    """
+    Ejecuta el bucle de app.py en modo kiosco y sin ventana durante `segundos`.
+
+    Args:
+        fuente (str): Archivo de vídeo (se repite al llegar al final).
+        interfaz (Interfaz): Compositor de pantallas.
+        segundos (float): Duración de la prueba.
+        telemetria (Telemetria): Muestreo de memoria y FPS.
+        registro (RegistroSesiones): Registro de analíticas.
+        segundos_postura (float): Segundos tras los que se salta una postura no superada.
+        segundos_inicio (float): Segundos en la pantalla de inicio antes de empezar.
+
+    Returns:
+        int: Sesiones completadas.
+    """
+    cap = camara_desde_config(config, fuente)
+    if not cap.abrir():
+        raise RuntimeError(f"No se puede abrir {fuente}")
+
+    origen = time.perf_counter()
+    estado = {"anterior": None, "en_inicio_desde": None, "completadas": 0}
+
+    def al_fotograma(motor):
+        # Hace las veces del usuario: empieza la sesión y salta las posturas
+        ahora = time.time()
+        if motor.estado == "INICIO":
+            if estado["anterior"] == "TERMINADO":
+                estado["completadas"] += 1
+            if estado["anterior"] != "INICIO":
+                estado["en_inicio_desde"] = ahora
+            elif ahora - estado["en_inicio_desde"] >= segundos_inicio:
+                motor.iniciar()
+        # Nadie va a superar las posturas de un vídeo cualquiera
+        elif motor.estado == "JUGANDO" and ahora - motor.postura_mostrada_en >= segundos_postura:
+            motor.saltar()
+        estado["anterior"] = motor.estado
+        return time.perf_counter() - origen >= segundos
+
+    try:
+        with PoseLandmarker.create_from_options(opciones_landmarker()) as landmarker:
+            ejecutar(landmarker, registro, cap, interfaz, kiosco=True, telemetria=telemetria,
+                     mostrar=False, al_fotograma=al_fotograma)
+    finally:
+        cap.release()
+    return estado["completadas"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de resistencia del modo kiosco")
+    parser.add_argument("video", help="Archivo de vídeo grabado")
+    parser.add_argument("--horas", type=float, default=4)
+    parser.add_argument("--intervalo", type=float, default=config.telemetria_intervalo,
+                        help="Segundos entre muestras de telemetría")
+    parser.add_argument("--max-crecimiento-mb", type=float, default=50,
+                        help="Crecimiento máximo de la RSS entre el principio y el final")
+    parser.add_argument("--max-caida-fps", type=float, default=0.1,
+                        help="Caída máxima de los FPS (fracción) entre el principio y el final")
+    parser.add_argument("--perfil", choices=sorted(config.perfiles_render), default=config.perfil_render)
+    parser.add_argument("--sin-tracemalloc", action="store_true",
+                        help="No rastrear asignaciones (la RSS y los FPS se siguen midiendo)")
+    args = parser.parse_args()
+
+    # Sin límite de FPS en juego: se vigila lo que el equipo puede sostener
+    config.fps_objetivo["JUGANDO"] = None
+    interfaz = Interfaz(args.perfil)
+    telemetria = Telemetria(args.intervalo, config.telemetria_top, rastrear_memoria=not args.sin_tracemalloc)
+
+    with tempfile.TemporaryDirectory() as directorio, \
+            RegistroSesiones(os.path.join(directorio, "sesiones.db")) as registro:
+        completadas = ejecutar_prueba(args.video, interfaz, args.horas * 3600, telemetria, registro)
+        print(f"Sesiones completadas: {completadas}, escritas en el registro: {registro.escritos}, "
+              f"descartadas: {registro.descartados}")
+    telemetria.muestrear(forzar=True)
+    telemetria.cerrar()
+
+    resultado = deriva(telemetria.muestras, clave_fps="fps_trabajo")
+    if resultado is None:
+        print("Muestras insuficientes para evaluar la deriva: alarga la prueba o reduce --intervalo.")
+        sys.exit(1)
+
+    fallos = []
+    if resultado["crecimiento_rss_mb"] is not None and resultado["crecimiento_rss_mb"] > args.max_crecimiento_mb:
+        fallos.append(f"la RSS ha crecido {resultado['crecimiento_rss_mb']:.1f} MB")
+    if resultado["caida_fps"] > args.max_caida_fps:
+        fallos.append(f"los FPS han caído un {100 * resultado['caida_fps']:.1f} %")
+
+    print(f"Deriva: {resultado}")
+    if fallos:
+        print("FALLO: " + "; ".join(fallos))
+        sys.exit(1)
+    print("OK")
@@ -0,0 +1,324 @@
+"""
+Almacén persistente de analíticas de sesión.
+
+Este módulo define `RegistroSesiones`, un almacén de solo anexado sobre SQLite
+(modo WAL) en el que se guardan las sesiones, el resultado de cada postura
+(superada o saltada con ENTER) y los ángulos medidos en cada fotograma junto con
+su error respecto al objetivo.
+
+Las escrituras nunca bloquean el bucle de vídeo: los métodos de registro solo
+encolan filas en una cola acotada que un hilo escritor vacía por lotes. Si el
+disco es lento y la cola se llena, los ángulos por fotograma se descartan (y se
+cuentan) antes que los eventos de sesión y de postura.
+
+Uso para consultar los agregados:
+    python registro_sesiones.py [--db RUTA]
+"""
+
+import argparse
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS sesiones (
+    id TEXT PRIMARY KEY,
+    inicio REAL NOT NULL,
+    fin REAL,
+    motivo TEXT
+);
+CREATE TABLE IF NOT EXISTS posturas (
+    sesion_id TEXT NOT NULL,
+    postura TEXT NOT NULL,
+    orden INTEGER NOT NULL,
+    resultado TEXT NOT NULL,
+    inicio REAL NOT NULL,
+    fin REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS angulos (
+    sesion_id TEXT NOT NULL,
+    t REAL NOT NULL,
+    postura TEXT NOT NULL,
+    angulo TEXT NOT NULL,
+    valor REAL,
+    error REAL
+);
+CREATE INDEX IF NOT EXISTS idx_posturas_postura ON posturas (postura, resultado);
+CREATE INDEX IF NOT EXISTS idx_angulos_postura ON angulos (postura, angulo);
+"""
+
+SQL_INSERCION = {
+    "sesion_inicio": "INSERT INTO sesiones (id, inicio) VALUES (?, ?)",
+    "sesion_fin": "UPDATE sesiones SET fin = ?, motivo = ? WHERE id = ?",
+    "postura": "INSERT INTO posturas (sesion_id, postura, orden, resultado, inicio, fin) "
+               "VALUES (?, ?, ?, ?, ?, ?)",
+    "angulos": "INSERT INTO angulos (sesion_id, t, postura, angulo, valor, error) "
+               "VALUES (?, ?, ?, ?, ?, ?)",
+}
+
+
+def conectar(ruta):
+    """
+    Abre una conexión SQLite en modo WAL con el esquema creado.
+
+    Args:
+        ruta (str): Ruta del archivo de base de datos.
+
+    Returns:
+        sqlite3.Connection: Conexión abierta.
+    """
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("PRAGMA synchronous=NORMAL")
+    conexion.executescript(ESQUEMA)
+    return conexion
+
+
+class RegistroSesiones:
+    """
+    Registro no bloqueante de sesiones con un hilo escritor en segundo plano.
+
+    Se usa como gestor de contexto; al salir se vacía la cola pendiente y se
+    cierra la base de datos.
+    """
+
+    def __init__(self, ruta, activo=True, max_pendientes=5000, reserva_eventos=100,
+                 tam_lote=500, intervalo_vaciado=0.5):
+        """
+        Args:
+            ruta (str): Ruta del archivo SQLite.
+            activo (bool): Si es False, todos los métodos de registro son no-ops.
+            max_pendientes (int): Capacidad máxima de la cola (límite de memoria).
+            reserva_eventos (int): Huecos de la cola reservados para eventos de
+                sesión y postura, que no se descartan por los ángulos.
+            tam_lote (int): Número máximo de elementos por transacción.
+            intervalo_vaciado (float): Segundos máximos entre escrituras.
+        """
+        self.ruta = ruta
+        self.activo = activo
+        self.max_pendientes = max_pendientes
+        self.reserva_eventos = reserva_eventos
+        self.tam_lote = tam_lote
+        self.intervalo_vaciado = intervalo_vaciado
+        self.descartados = 0
+        self.escritos = 0
+        self.fallidos = 0
+
+        self._cola = queue.Queue(maxsize=max_pendientes)
+        self._hilo = None
+        if self.activo:
+            os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+            conectar(ruta).close()
+            self._hilo = threading.Thread(target=self._escritor, name="registro-sesiones", daemon=True)
+            self._hilo.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _encolar(self, tipo, filas, descartable):
+        if not self.activo:
+            return
+        if descartable and self._cola.qsize() >= self.max_pendientes - self.reserva_eventos:
+            self.descartados += len(filas)
+            return
+        try:
+            self._cola.put_nowait((tipo, filas))
+        except queue.Full:
+            self.descartados += len(filas)
+
+    def iniciar_sesion(self, t=None):
+        """
+        Registra el comienzo de una sesión.
+
+        Returns:
+            str: Identificador único de la sesión.
+        """
+        sesion_id = uuid.uuid4().hex
+        self._encolar("sesion_inicio", [(sesion_id, time.time() if t is None else t)], False)
+        return sesion_id
+
+    def finalizar_sesion(self, sesion_id, motivo, t=None):
+        """
+        Registra el final de una sesión.
+
+        Args:
+            sesion_id (str): Identificador devuelto por `iniciar_sesion`.
+            motivo (str): 'completada' o 'abandonada'.
+        """
+        self._encolar("sesion_fin", [(time.time() if t is None else t, motivo, sesion_id)], False)
+
+    def registrar_postura(self, sesion_id, postura, orden, resultado, inicio, fin):
+        """
+        Registra el resultado de una postura.
+
+        Args:
+            sesion_id (str): Identificador de la sesión.
+            postura (str): Nombre de la postura en `POSTURAS_YOGA`.
+            orden (int): Posición de la postura en la secuencia.
+            resultado (str): 'superada' o 'saltada'.
+            inicio (float): Instante en que se mostró la postura.
+            fin (float): Instante en que se superó o se saltó.
+        """
+        self._encolar("postura", [(sesion_id, postura, orden, resultado, inicio, fin)], False)
+
+    def registrar_angulos(self, sesion_id, postura, t, angulos):
+        """
+        Registra los ángulos medidos en un fotograma.
+
+        Args:
+            sesion_id (str): Identificador de la sesión.
+            postura (str): Postura activa.
+            t (float): Instante del fotograma.
+            angulos (dict): Nombre del ángulo -> (valor, error). Ambos pueden ser
+                None si la articulación no era visible.
+        """
+        filas = [(sesion_id, t, postura, nombre, valor, error)
+                 for nombre, (valor, error) in angulos.items()]
+        if filas:
+            self._encolar("angulos", filas, True)
+
+    def _escritor(self):
+        """
+        Bucle del hilo escritor: agrupa elementos de la cola y los inserta por lotes.
+
+        Un error de escritura (disco lleno, base de datos bloqueada, fila
+        inválida) pierde solo ese lote: se cuenta en `fallidos` y el hilo sigue
+        vaciando la cola, de modo que la aplicación nunca se queda bloqueada.
+        """
+        try:
+            conexion = conectar(self.ruta)
+        except sqlite3.Error as e:
+            print(f"Registro de sesiones: no se puede abrir {self.ruta} ({e})")
+            conexion = None
+        terminar = False
+        while not terminar:
+            lote = []
+            try:
+                elemento = self._cola.get(timeout=self.intervalo_vaciado)
+                lote.append(elemento)
+                while len(lote) < self.tam_lote:
+                    lote.append(self._cola.get_nowait())
+            except queue.Empty:
+                pass
+
+            if None in lote:
+                terminar = True
+                lote = [e for e in lote if e is not None]
+            if not lote:
+                continue
+
+            filas_lote = sum(len(filas) for _, filas in lote)
+            if conexion is None:
+                self.fallidos += filas_lote
+                continue
+            # Una sola transacción por lote, respetando el orden de llegada
+            try:
+                with conexion:
+                    for tipo, filas in lote:
+                        conexion.executemany(SQL_INSERCION[tipo], filas)
+            except Exception as e:
+                self.fallidos += filas_lote
+                print(f"Registro de sesiones: lote de {filas_lote} filas no escrito ({e})")
+            else:
+                self.escritos += filas_lote
+        if conexion is not None:
+            conexion.close()
+
+    def cerrar(self, timeout=10):
+        """
+        Vacía la cola pendiente y detiene el hilo escritor.
+
+        Args:
+            timeout (float): Segundos máximos de espera para el vaciado.
+        """
+        if self._hilo is None:
+            return
+        if self._hilo.is_alive():
+            try:
+                self._cola.put(None, timeout=timeout)
+            except queue.Full:
+                print("Registro de sesiones: el escritor no vacía la cola; se cierra sin esperar")
+            else:
+                self._hilo.join(timeout)
+        self._hilo = None
+        if self.descartados:
+            print(f"Registro de sesiones: {self.descartados} filas descartadas por cola llena")
+        if self.fallidos:
+            print(f"Registro de sesiones: {self.fallidos} filas perdidas por errores de escritura")
+
+
+def resumen_por_postura(ruta):
+    """
+    Calcula la tasa de éxito y el tiempo medio de superación de cada postura.
+
+    Args:
+        ruta (str): Ruta del archivo SQLite.
+
+    Returns:
+        list: Tuplas (postura, intentos, superadas, tasa_exito, segundos_medios),
+            donde segundos_medios solo considera las posturas superadas.
+    """
+    conexion = conectar(ruta)
+    try:
+        return conexion.execute("""
+            SELECT postura,
+                   COUNT(*),
+                   SUM(resultado = 'superada'),
+                   AVG(resultado = 'superada'),
+                   AVG(CASE WHEN resultado = 'superada' THEN fin - inicio END)
+            FROM posturas
+            GROUP BY postura
+            ORDER BY postura
+        """).fetchall()
+    finally:
+        conexion.close()
+
+
+def error_medio_por_angulo(ruta, postura):
+    """
+    Calcula el error medio de cada ángulo medido en una postura.
+
+    Args:
+        ruta (str): Ruta del archivo SQLite.
+        postura (str): Nombre de la postura.
+
+    Returns:
+        list: Tuplas (angulo, error_medio, fotogramas).
+    """
+    conexion = conectar(ruta)
+    try:
+        return conexion.execute("""
+            SELECT angulo, AVG(error), COUNT(error)
+            FROM angulos
+            WHERE postura = ?
+            GROUP BY angulo
+            ORDER BY angulo
+        """, (postura,)).fetchall()
+    finally:
+        conexion.close()
+
+
+if __name__ == "__main__":
+    from config import config
+
+    parser = argparse.ArgumentParser(description="Agregados de las sesiones registradas")
+    parser.add_argument("--db", default=config.ruta_sesiones, help="Archivo SQLite de sesiones")
+    parser.add_argument("--postura", help="Mostrar el error medio por ángulo de esta postura")
+    args = parser.parse_args()
+
+    if args.postura:
+        print(f"{'ANGULO':<22}{'ERROR MEDIO':>12}{'FOTOGRAMAS':>12}")
+        for angulo, error, fotogramas in error_medio_por_angulo(args.db, args.postura):
+            error_txt = f"{error:.1f}" if error is not None else "-"
+            print(f"{angulo:<22}{error_txt:>12}{fotogramas:>12}")
+    else:
+        print(f"{'POSTURA':<22}{'INTENTOS':>10}{'EXITO':>8}{'T. MEDIO':>10}")
+        for postura, intentos, superadas, tasa, segundos in resumen_por_postura(args.db):
+            segundos_txt = f"{segundos:.1f}s" if segundos is not None else "-"
+            print(f"{postura:<22}{intentos:>10}{tasa * 100:>7.0f}%{segundos_txt:>10}")
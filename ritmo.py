@@ -0,0 +1,99 @@
+"""
+Control del ritmo de fotogramas (frame pacing) del bucle principal.
+
+Este módulo define `RitmoFotogramas`, un planificador que limita la frecuencia
+del bucle de vídeo según el estado del juego. Las pantallas de reposo (INICIO y
+TERMINADO) se refrescan a pocos fotogramas por segundo, mientras que el estado
+JUGANDO se ajusta a un objetivo configurable en lugar de girar en vacío.
+
+La espera se delega en `cv2.waitKey`, que además de dormir procesa los eventos
+de la ventana, por lo que el planificador solo calcula cuántos milisegundos
+quedan hasta el siguiente fotograma.
+"""
+
+import time
+
+
+class RitmoFotogramas:
+    """
+    Planificador de fotogramas con frecuencia objetivo por estado.
+
+    Mantiene una fecha límite para el siguiente fotograma y calcula la espera
+    necesaria para cumplirla. Si el bucle se retrasa más de un periodo completo,
+    la fecha límite se reinicia para no intentar recuperar fotogramas perdidos.
+    """
+
+    def __init__(self, fps_por_estado, reloj=time.perf_counter):
+        """
+        Args:
+            fps_por_estado (dict): Frecuencia objetivo por estado del juego. Un
+                valor None o 0 desactiva la limitación para ese estado.
+            reloj (callable): Función que devuelve el tiempo actual en segundos.
+        """
+        self.fps_por_estado = dict(fps_por_estado)
+        self.reloj = reloj
+        self.fps_medido = 0.0
+        self._siguiente = None
+        self._estado = None
+        self._ultimo = None
+
+    def periodo(self, estado):
+        """
+        Devuelve el periodo objetivo en segundos para un estado.
+
+        Returns:
+            float: Periodo en segundos, o 0.0 si el estado no está limitado.
+        """
+        fps = self.fps_por_estado.get(estado)
+        if not fps:
+            return 0.0
+        return 1.0 / fps
+
+    def espera_ms(self, estado):
+        """
+        Calcula cuántos milisegundos esperar antes del siguiente fotograma.
+
+        Debe llamarse una vez por iteración, justo antes de `cv2.waitKey`. Un
+        cambio de estado reinicia la fecha límite para que la nueva frecuencia
+        se aplique de inmediato.
+
+        Args:
+            estado (str): Estado actual del juego.
+
+        Returns:
+            int: Milisegundos de espera (mínimo 1, requerido por `cv2.waitKey`).
+        """
+        ahora = self.reloj()
+
+        # Frecuencia medida con media móvil exponencial
+        if self._ultimo is not None and ahora > self._ultimo:
+            instantaneo = 1.0 / (ahora - self._ultimo)
+            self.fps_medido = 0.9 * self.fps_medido + 0.1 * instantaneo if self.fps_medido else instantaneo
+        self._ultimo = ahora
+
+        periodo = self.periodo(estado)
+        if periodo == 0.0:
+            self._siguiente = None
+            self._estado = estado
+            return 1
+
+        if estado != self._estado or self._siguiente is None or ahora - self._siguiente > periodo:
+            self._siguiente = ahora
+        self._estado = estado
+
+        self._siguiente += periodo
+        restante = self._siguiente - ahora
+        return max(1, int(restante * 1000))
+
+    @staticmethod
+    def es_reposo(estado):
+        """
+        Indica si un estado es una pantalla de reposo que no usa la cámara.
+
+        Args:
+            estado (str): Estado del juego.
+
+        Returns:
+            bool: True para INICIO y TERMINADO.
+        """
+        return estado in ("INICIO", "TERMINADO")
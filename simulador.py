@@ -0,0 +1,255 @@
+"""
+Simulador de sesiones sin cámara, modelo ni ventana.
+
+Aplica las reglas de `MotorSesion` a flujos de ángulos sintéticos o a una
+grabación de landmarks. Sirve para someter a carga las definiciones de
+`POSTURAS_YOGA` y las reglas de tiempo (tolerancias, `segundos_para_superar`)
+con miles de sesiones: los veredictos de cada intento de postura se calculan por
+lotes y el fotograma en que se supera se obtiene de forma vectorizada como la
+primera racha suficientemente larga de fotogramas correctos. Con una sola
+sesión (`--sesiones 1`) se recorre fotograma a fotograma con `MotorSesion` y un
+`RelojSimulado`, y se muestra el resultado de cada postura.
+
+Flujo sintético: cada usuario simulado se acerca a la postura objetivo con una
+convergencia exponencial, un sesgo propio por ángulo (que puede impedirle
+superar alguna postura) y ruido por fotograma. Si no supera la postura en su
+tiempo de paciencia, la salta con ENTER.
+
+Grabación: archivo `.npy` con un array (N, 33, 3) de landmarks (x, y, visibility)
+por fotograma, que se reproduce desde una posición aleatoria en cada postura.
+
+Uso:
+    python simulador.py [--sesiones N] [--fps F] [--procesos P] [--grabacion ARCHIVO.npy]
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+from config import config
+from posturas import POSTURAS_YOGA, LISTA_POSTURAS
+from evaluacion import angulos_lote, nombres_angulos, veredictos_lote
+from motor_sesion import MotorSesion, RelojSimulado
+
+
+def _angulos_sinteticos(rng, definicion_postura, fotogramas, fps, usuario):
+    """
+    Genera la serie de ángulos de un usuario simulado intentando una postura.
+
+    Returns:
+        numpy.ndarray: Array (fotogramas, K) en grados, con NaN en las oclusiones.
+    """
+    nombres = nombres_angulos(definicion_postura)
+    objetivos = np.array([definicion_postura[nombre] for nombre in nombres], dtype=np.float64)
+    t = (np.arange(fotogramas) / fps)[:, np.newaxis]
+
+    sesgo = rng.normal(0, usuario["habilidad"], len(nombres))
+    desvio_inicial = rng.normal(0, 60, len(nombres))
+    ruido = rng.normal(0, usuario["temblor"], (fotogramas, len(nombres)))
+
+    angulos = objetivos + sesgo + desvio_inicial * np.exp(-t / usuario["tau"]) + ruido
+    angulos = np.clip(angulos, 0, 180)
+    angulos[rng.random(angulos.shape) < usuario["oclusion"]] = np.nan
+    return angulos
+
+
+def _usuario_aleatorio(rng):
+    """Parámetros de un usuario simulado."""
+    return {
+        "habilidad": rng.uniform(5, 35),
+        "temblor": rng.uniform(2, 8),
+        "tau": rng.uniform(0.5, 4),
+        "oclusion": rng.uniform(0, 0.05),
+        "paciencia": rng.uniform(10, 30),
+    }
+
+
+def _veredictos_postura(rng, nombre, usuario, fps, veredictos_grabacion=None):
+    """
+    Veredicto (todo correcto) de cada fotograma de un intento de postura, hasta
+    que se agota la paciencia del usuario.
+
+    Returns:
+        numpy.ndarray: Array booleano (fotogramas,).
+    """
+    fotogramas = int(usuario["paciencia"] * fps)
+    if veredictos_grabacion is None:
+        angulos = _angulos_sinteticos(rng, POSTURAS_YOGA[nombre], fotogramas, fps, usuario)
+        return veredictos_lote(angulos, POSTURAS_YOGA[nombre])[2]
+    serie = veredictos_grabacion[nombre]
+    return np.resize(np.roll(serie, -rng.integers(len(serie))), fotogramas)
+
+
+def fotogramas_para_superar(segundos_para_superar, fps):
+    """
+    Fotogramas correctos seguidos con los que `MotorSesion` da una postura por
+    superada: el primero pone en marcha el temporizador y la postura se supera
+    cuando el tiempo mantenido es mayor que `segundos_para_superar`.
+    """
+    return int(np.floor(segundos_para_superar * fps + 1e-9)) + 2
+
+
+def resolver_postura(veredictos, necesarios):
+    """
+    Resultado de un intento de postura a partir de sus veredictos por fotograma.
+
+    Equivale a pasar los veredictos uno a uno por `MotorSesion.actualizar`: la
+    postura se supera en el fotograma que completa la primera racha de
+    `necesarios` fotogramas correctos seguidos.
+
+    Args:
+        veredictos (numpy.ndarray): Array booleano (fotogramas,).
+        necesarios (int): Longitud de la racha (ver `fotogramas_para_superar`).
+
+    Returns:
+        tuple: (superada, fotogramas) con los fotogramas consumidos hasta
+            superarla, o todos si se agota la paciencia.
+    """
+    posiciones = np.arange(len(veredictos))
+    # Longitud de la racha de correctos que termina en cada fotograma
+    ultimo_fallo = np.maximum.accumulate(np.where(veredictos, -1, posiciones))
+    rachas = posiciones - ultimo_fallo
+    completas = np.flatnonzero(rachas >= necesarios)
+    if len(completas):
+        return True, int(completas[0]) + 1
+    return False, len(veredictos)
+
+
+def _veredictos_grabacion(grabacion):
+    """Veredictos de cada postura sobre todos los fotogramas de una grabación, calculados una vez."""
+    veredictos = {}
+    for nombre in LISTA_POSTURAS:
+        definicion = POSTURAS_YOGA[nombre]
+        angulos = angulos_lote(grabacion, nombres_angulos(definicion))
+        veredictos[nombre] = veredictos_lote(angulos, definicion)[2]
+    return veredictos
+
+
+def simular(sesiones, fps=30, semilla=0, grabacion=None):
+    """
+    Simula un número de sesiones completas.
+
+    Cada intento de postura se resuelve de una vez con `resolver_postura` sobre
+    los veredictos del lote, sin recorrer los fotogramas en Python.
+
+    Args:
+        sesiones (int): Número de sesiones a simular.
+        fps (float): Frecuencia de fotogramas simulada.
+        semilla (int): Semilla del generador aleatorio.
+        grabacion (numpy.ndarray): Landmarks (N, 33, 3) a reproducir, o None
+            para usar flujos sintéticos.
+
+    Returns:
+        dict: Por postura, {"superadas": int, "saltadas": int, "segundos": float}
+            con la suma de tiempos hasta superar, y el total de fotogramas en
+            la clave especial "_fotogramas".
+    """
+    rng = np.random.default_rng(semilla)
+    necesarios = fotogramas_para_superar(config.segundos_para_superar, fps)
+    veredictos_grabacion = _veredictos_grabacion(grabacion) if grabacion is not None else None
+
+    estadisticas = {nombre: {"superadas": 0, "saltadas": 0, "segundos": 0.0} for nombre in LISTA_POSTURAS}
+    fotogramas_totales = 0
+
+    for _ in range(sesiones):
+        usuario = _usuario_aleatorio(rng)
+        for nombre in LISTA_POSTURAS:
+            veredictos = _veredictos_postura(rng, nombre, usuario, fps, veredictos_grabacion)
+            superada, fotogramas = resolver_postura(veredictos, necesarios)
+            fotogramas_totales += fotogramas
+            if superada:
+                estadisticas[nombre]["superadas"] += 1
+                estadisticas[nombre]["segundos"] += fotogramas / fps
+            else:
+                # El usuario pierde la paciencia y pulsa ENTER
+                estadisticas[nombre]["saltadas"] += 1
+
+    estadisticas["_fotogramas"] = fotogramas_totales
+    return estadisticas
+
+
+def simular_sesion(fps=30, semilla=0, grabacion=None):
+    """
+    Simula una sola sesión fotograma a fotograma con `MotorSesion` y un
+    `RelojSimulado`, como la recorrería la aplicación.
+
+    Returns:
+        list: `MotorSesion.resultados` de la sesión, (postura, resultado, inicio, fin).
+    """
+    rng = np.random.default_rng(semilla)
+    reloj = RelojSimulado()
+    motor = MotorSesion(LISTA_POSTURAS, config.segundos_para_superar, reloj=reloj)
+    veredictos_grabacion = _veredictos_grabacion(grabacion) if grabacion is not None else None
+    dt = 1.0 / fps
+
+    usuario = _usuario_aleatorio(rng)
+    motor.iniciar()
+    while motor.estado == "JUGANDO":
+        idx = motor.postura_idx
+        for correcto in _veredictos_postura(rng, motor.postura_actual, usuario, fps, veredictos_grabacion).tolist():
+            reloj.avanzar(dt)
+            motor.actualizar(correcto)
+            if motor.postura_idx != idx:
+                break
+        else:
+            # El usuario pierde la paciencia y pulsa ENTER
+            motor.saltar()
+    return motor.resultados
+
+
+def _simular_bloque(argumentos):
+    return simular(*argumentos)
+
+
+def combinar(parciales):
+    """Suma las estadísticas de varios bloques de simulación."""
+    total = {nombre: {"superadas": 0, "saltadas": 0, "segundos": 0.0} for nombre in LISTA_POSTURAS}
+    total["_fotogramas"] = 0
+    for parcial in parciales:
+        total["_fotogramas"] += parcial.pop("_fotogramas")
+        for nombre, valores in parcial.items():
+            for clave, valor in valores.items():
+                total[nombre][clave] += valor
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulador de sesiones de yoga")
+    parser.add_argument("--sesiones", type=int, default=1000)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--grabacion", help="Archivo .npy con landmarks (N, 33, 3)")
+    args = parser.parse_args()
+
+    grabacion = np.load(args.grabacion) if args.grabacion else None
+
+    if args.sesiones == 1:
+        for nombre, resultado, inicio, fin in simular_sesion(args.fps, args.semilla, grabacion):
+            print(f"{nombre:<22}{resultado:>10}{fin - inicio:>8.1f}s")
+        raise SystemExit(0)
+
+    # Reparto de las sesiones en bloques con semillas distintas
+    bloques = [(args.sesiones // args.procesos + (i < args.sesiones % args.procesos),
+                args.fps, args.semilla + i, grabacion) for i in range(args.procesos)]
+
+    t0 = time.perf_counter()
+    if args.procesos > 1:
+        with multiprocessing.Pool(args.procesos) as pool:
+            estadisticas = combinar(pool.map(_simular_bloque, bloques))
+    else:
+        estadisticas = combinar([simular(*bloques[0])])
+    duracion = time.perf_counter() - t0
+
+    fotogramas = estadisticas.pop("_fotogramas")
+    print(f"{args.sesiones} sesiones, {fotogramas} fotogramas en {duracion:.2f}s "
+          f"({args.sesiones / duracion:.0f} sesiones/s, {fotogramas / duracion:.0f} fotogramas/s)")
+    print(f"{'POSTURA':<22}{'SUPERADAS':>10}{'SALTADAS':>10}{'EXITO':>8}{'T. MEDIO':>10}")
+    for nombre in LISTA_POSTURAS:
+        e = estadisticas[nombre]
+        intentos = e["superadas"] + e["saltadas"]
+        exito = e["superadas"] / intentos if intentos else 0
+        t_medio = f"{e['segundos'] / e['superadas']:.1f}s" if e["superadas"] else "-"
+        print(f"{nombre:<22}{e['superadas']:>10}{e['saltadas']:>10}{exito * 100:>7.0f}%{t_medio:>10}")
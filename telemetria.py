@@ -0,0 +1,201 @@
+"""
+Telemetría de memoria y rendimiento para ejecuciones de larga duración.
+
+Este módulo define `Telemetria`, que acumula la duración de cada fotograma y
+cada `intervalo` segundos toma una muestra con:
+
+    - Los FPS reales del periodo y el tiempo de trabajo por fotograma (media y
+      percentil 95), que excluye la espera del ritmo de fotogramas. De este se
+      derivan los FPS que el equipo podría sostener sin esperas.
+    - La memoria residente (RSS) del proceso.
+    - Opcionalmente, las líneas de código cuya memoria más ha crecido desde la
+      muestra anterior, según `tracemalloc`.
+
+`deriva` compara las primeras muestras con las últimas para detectar fugas de
+memoria o degradación de los FPS.
+"""
+
+import collections
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def rss_mb():
+    """
+    Memoria residente actual del proceso.
+
+    Returns:
+        float: RSS en MB, o None si no puede obtenerse en esta plataforma. Fuera
+            de Linux se devuelve el máximo alcanzado (`ru_maxrss`).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS lo devuelve en bytes y Linux en KB
+    return maximo / 2 ** 20 if sys.platform == "darwin" else maximo / 1024
+
+
+class Telemetria:
+    """
+    Muestreo periódico de FPS, tiempo por fotograma, RSS y asignaciones.
+
+    Uso:
+        telemetria.fotograma(segundos_de_trabajo)   # en cada vuelta del bucle
+        muestra = telemetria.muestrear()             # dict o None
+
+    Atributos públicos:
+        muestras (collections.deque): Últimas muestras tomadas (las más antiguas
+            se descartan para que la propia telemetría no crezca sin límite).
+    """
+
+    def __init__(self, intervalo=60, top=5, rastrear_memoria=False, max_muestras=1440,
+                 reloj=time.perf_counter):
+        """
+        Args:
+            intervalo (float): Segundos entre muestras.
+            top (int): Número de líneas de código a listar por crecimiento de memoria.
+            rastrear_memoria (bool): Activar `tracemalloc` (tiene un coste apreciable
+                en cada asignación).
+            max_muestras (int): Muestras que se conservan.
+            reloj (callable): Función que devuelve el tiempo actual en segundos.
+        """
+        self.intervalo = intervalo
+        self.top = top
+        self.rastrear_memoria = rastrear_memoria
+        self.reloj = reloj
+        self.muestras = collections.deque(maxlen=max_muestras)
+
+        self._t_inicio = self._t_muestra = reloj()
+        self._duraciones = []
+        self._snapshot = None
+        if rastrear_memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._snapshot = self._tomar_snapshot()
+
+    @staticmethod
+    def _tomar_snapshot():
+        # Las asignaciones del propio tracemalloc no interesan
+        return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+    def fotograma(self, duracion_trabajo):
+        """
+        Registra un fotograma.
+
+        Args:
+            duracion_trabajo (float): Segundos dedicados al fotograma sin contar la
+                espera del ritmo de fotogramas.
+        """
+        self._duraciones.append(duracion_trabajo)
+
+    def muestrear(self, forzar=False):
+        """
+        Toma una muestra si ha pasado el intervalo.
+
+        Args:
+            forzar (bool): Tomar la muestra aunque no haya pasado el intervalo.
+
+        Returns:
+            dict: Muestra con 't' (segundos desde el inicio), 'fotogramas', 'fps',
+                'fps_trabajo' (FPS sostenibles sin esperas), 'trabajo_ms',
+                'trabajo_p95_ms', 'rss_mb' y 'crecimiento' (lista de
+                (línea, KB) con las líneas cuya memoria más ha crecido), o None si
+                todavía no toca.
+        """
+        ahora = self.reloj()
+        transcurrido = ahora - self._t_muestra
+        if not forzar and transcurrido < self.intervalo:
+            return None
+
+        duraciones = np.array(self._duraciones) if self._duraciones else np.zeros(1)
+        muestra = {
+            "t": ahora - self._t_inicio,
+            "fotogramas": len(self._duraciones),
+            "fps": len(self._duraciones) / transcurrido if transcurrido > 0 else 0.0,
+            "fps_trabajo": 1 / float(duraciones.mean()) if duraciones.mean() > 0 else 0.0,
+            "trabajo_ms": 1000 * float(duraciones.mean()),
+            "trabajo_p95_ms": 1000 * float(np.percentile(duraciones, 95)),
+            "rss_mb": rss_mb(),
+            "crecimiento": [],
+        }
+
+        if self.rastrear_memoria and tracemalloc.is_tracing():
+            snapshot = self._tomar_snapshot()
+            diferencias = snapshot.compare_to(self._snapshot, "lineno")[:self.top]
+            muestra["crecimiento"] = [(str(d.traceback[0]), d.size_diff / 1024) for d in diferencias]
+            self._snapshot = snapshot
+
+        self.muestras.append(muestra)
+        self._duraciones = []
+        self._t_muestra = ahora
+        return muestra
+
+    def cerrar(self):
+        """Detiene `tracemalloc` si lo activó esta instancia."""
+        if self.rastrear_memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._snapshot = None
+
+
+def formatear_muestra(muestra):
+    """
+    Returns:
+        str: Resumen de una muestra en varias líneas para la consola.
+    """
+    rss = "?" if muestra["rss_mb"] is None else f"{muestra['rss_mb']:.1f} MB"
+    lineas = [f"[{muestra['t'] / 60:7.1f} min] {muestra['fps']:5.1f} FPS, "
+              f"trabajo {muestra['trabajo_ms']:.1f} ms (p95 {muestra['trabajo_p95_ms']:.1f} ms), RSS {rss}"]
+    for linea, kb in muestra["crecimiento"]:
+        lineas.append(f"    {kb:+9.1f} KB  {linea}")
+    return "\n".join(lineas)
+
+
+def deriva(muestras, calentamiento=2, ventana=3, clave_fps="fps"):
+    """
+    Compara el principio y el final de una serie de muestras.
+
+    Args:
+        muestras (iterable): Muestras de `Telemetria.muestrear`.
+        calentamiento (int): Muestras iniciales que se ignoran (carga del modelo,
+            cachés, primeras asignaciones).
+        ventana (int): Muestras que se promedian en cada extremo.
+        clave_fps (str): 'fps' para los FPS reales o 'fps_trabajo' para los
+            sostenibles, que no dependen del ritmo ni de las pantallas visitadas.
+
+    Returns:
+        dict: 'crecimiento_rss_mb' (None si no se conoce la RSS), 'caida_fps'
+            (fracción, positiva si los FPS bajan) y 'aumento_trabajo' (fracción,
+            positiva si cada fotograma tarda más), o None si no hay muestras
+            suficientes.
+    """
+    # Las muestras sin fotogramas (por ejemplo, todo el periodo en reposo) no dicen nada de los FPS
+    muestras = [m for m in list(muestras)[calentamiento:] if m["fotogramas"]]
+    if len(muestras) < 2 * ventana:
+        return None
+    inicio, final = muestras[:ventana], muestras[-ventana:]
+
+    def media(grupo, clave):
+        return sum(m[clave] for m in grupo) / len(grupo)
+
+    crecimiento = None
+    if all(m["rss_mb"] is not None for m in inicio + final):
+        crecimiento = media(final, "rss_mb") - media(inicio, "rss_mb")
+    fps_inicio = media(inicio, clave_fps)
+    trabajo_inicio = media(inicio, "trabajo_ms")
+    return {
+        "crecimiento_rss_mb": crecimiento,
+        "caida_fps": 1 - media(final, clave_fps) / fps_inicio if fps_inicio else 0.0,
+        "aumento_trabajo": media(final, "trabajo_ms") / trabajo_inicio - 1 if trabajo_inicio else 0.0,
+    }
@@ -0,0 +1,72 @@
+"""La evaluación por lotes coincide con la evaluación por fotograma."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from angulos import ANGULO_LANDMARKS_MAP
+from evaluacion import (VISIBILIDAD_MINIMA, angulos_lote, calcular_angulo, evaluar_postura, nombres_angulos,
+                        veredictos_lote)
+from posturas import POSTURAS_YOGA
+
+
+def _landmarks_aleatorios(n, semilla=0):
+    """
+    Lote (n, 33, 3) con x, y, visibility aleatorios, que incluye puntos poco
+    visibles, visibilidad exactamente en el umbral, puntos repetidos (ángulo no
+    definido) y puntos alineados (0 y 180 grados).
+    """
+    rng = np.random.default_rng(semilla)
+    landmarks = rng.random((n, 33, 3))
+    landmarks[rng.random((n, 33)) < 0.1, 2] = VISIBILIDAD_MINIMA
+    for i, (a, b, c) in enumerate(ANGULO_LANDMARKS_MAP.values()):
+        f = 4 * i
+        landmarks[f, a, :2] = landmarks[f, b, :2]
+        landmarks[f + 1, c, :2] = landmarks[f + 1, b, :2]
+        landmarks[f + 2, c, :2] = 2 * landmarks[f + 2, b, :2] - landmarks[f + 2, a, :2]
+        landmarks[f + 3, c, :2] = landmarks[f + 3, a, :2]
+        landmarks[f:f + 4, [a, b, c], 2] = 1.0
+    return landmarks
+
+
+def _como_mediapipe(fila):
+    return [SimpleNamespace(x=x, y=y, visibility=v) for x, y, v in fila]
+
+
+def test_angulos_lote_coincide_con_calcular_angulo():
+    landmarks = _landmarks_aleatorios(200)
+    nombres = list(ANGULO_LANDMARKS_MAP)
+    angulos = angulos_lote(landmarks, nombres)
+
+    for fila, esperados in zip(landmarks, angulos):
+        puntos = _como_mediapipe(fila)
+        for nombre, valor in zip(nombres, esperados):
+            a, b, c = ANGULO_LANDMARKS_MAP[nombre]
+            referencia = calcular_angulo(puntos[a], puntos[b], puntos[c])
+            if referencia is None:
+                assert np.isnan(valor)
+            else:
+                assert valor == pytest.approx(referencia, abs=1e-6)
+
+
+@pytest.mark.parametrize("postura", sorted(POSTURAS_YOGA))
+def test_veredictos_lote_coincide_con_evaluar_postura(postura):
+    definicion = POSTURAS_YOGA[postura]
+    nombres = nombres_angulos(definicion)
+    landmarks = _landmarks_aleatorios(200, semilla=1)
+    # Acercar parte de los ángulos al objetivo para que haya fotogramas correctos
+    landmarks[::2] = _landmarks_aleatorios(100, semilla=2)
+
+    errores, correctos, todo_correcto = veredictos_lote(angulos_lote(landmarks, nombres), definicion)
+
+    for i, fila in enumerate(landmarks):
+        angulos, colores, referencia = evaluar_postura(_como_mediapipe(fila), definicion)
+        assert bool(todo_correcto[i]) == referencia
+        for k, nombre in enumerate(nombres):
+            valor, error = angulos[nombre]
+            if valor is None:
+                assert np.isnan(errores[i, k]) and not correctos[i, k]
+            else:
+                assert errores[i, k] == pytest.approx(error, abs=1e-6)
+                assert bool(correctos[i, k]) == (error <= definicion["tolerancia"])
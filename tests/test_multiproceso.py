@@ -0,0 +1,76 @@
+"""Anillo de memoria compartida entre dos procesos: las ranuras rotas o sobrescritas se rechazan."""
+
+import multiprocessing
+
+import numpy as np
+
+from multiproceso import AnilloCompartido
+
+TIMEOUT = 10
+
+
+def _escritor(descriptor, seguir, hecho):
+    """
+    Proceso escritor guiado paso a paso por el test (anillo de dos ranuras):
+        1. Publica las secuencias 0 y 1.
+        2. Empieza a escribir la secuencia 2, que reutiliza la ranura de la 0,
+           sin publicarla.
+        3. Termina y publica la secuencia 2.
+    """
+    anillo = AnilloCompartido(*descriptor)
+    for _ in range(2):
+        seq, vista = anillo.comenzar_escritura()
+        vista[:] = seq + 1
+        anillo.publicar(seq, float(seq))
+    hecho.set()
+
+    seguir.wait(TIMEOUT)
+    seguir.clear()
+    seq, vista = anillo.comenzar_escritura()
+    vista[:2] = seq + 1
+    hecho.set()
+
+    seguir.wait(TIMEOUT)
+    vista[:] = seq + 1
+    anillo.publicar(seq, float(seq))
+    anillo.cerrar()
+
+
+def test_ranura_rota_o_sobrescrita_se_rechaza():
+    anillo = AnilloCompartido((4, 4), np.uint8, ranuras=2)
+    seguir, hecho = multiprocessing.Event(), multiprocessing.Event()
+    proceso = multiprocessing.Process(target=_escritor, args=(anillo.descriptor(), seguir, hecho))
+    proceso.start()
+    try:
+        assert hecho.wait(TIMEOUT)
+        hecho.clear()
+        assert anillo.ultimo() == 1
+        vista = anillo.leer(0)
+        assert vista is not None and (vista == 1).all()
+        assert anillo.instante(0) == 0.0
+
+        # Ranura a medio sobrescribir: la secuencia 0 deja de ser vigente y la 2 aún no es legible
+        seguir.set()
+        assert hecho.wait(TIMEOUT)
+        assert anillo.ultimo() == 1
+        assert not anillo.vigente(0)
+        assert anillo.leer(0) is None
+        assert anillo.copiar(0) is None
+        assert anillo.leer(2) is None
+        assert anillo.copiar(2) is None
+        copia = anillo.copiar(1)
+        assert copia is not None and (copia == 2).all()
+
+        # Publicada la secuencia 2, la 0 sigue rechazada aunque la vista antigua apunte a datos nuevos
+        seguir.set()
+        proceso.join(TIMEOUT)
+        assert proceso.exitcode == 0
+        assert anillo.ultimo() == 2
+        assert not anillo.vigente(0)
+        assert (vista == 3).all()
+        copia = anillo.copiar(2)
+        assert copia is not None and (copia == 3).all()
+    finally:
+        if proceso.is_alive():
+            proceso.terminate()
+        anillo.cerrar()
@@ -0,0 +1,29 @@
+"""La resolución vectorizada de una postura coincide con `MotorSesion`."""
+
+import numpy as np
+import pytest
+
+from motor_sesion import MotorSesion, RelojSimulado
+from simulador import fotogramas_para_superar, resolver_postura
+
+
+def _resolver_con_motor(veredictos, segundos_para_superar, fps):
+    reloj = RelojSimulado()
+    motor = MotorSesion(["postura"], segundos_para_superar, reloj=reloj)
+    motor.iniciar()
+    for i, correcto in enumerate(veredictos.tolist()):
+        reloj.avanzar(1.0 / fps)
+        motor.actualizar(correcto)
+        if motor.estado != "JUGANDO":
+            return True, i + 1
+    return False, len(veredictos)
+
+
+# S * fps no entero, para que el redondeo del reloj simulado no decida el fotograma
+@pytest.mark.parametrize("segundos, fps", [(1.02, 20), (0.55, 30), (2.05, 10)])
+def test_resolver_postura_coincide_con_motor(segundos, fps):
+    rng = np.random.default_rng(0)
+    necesarios = fotogramas_para_superar(segundos, fps)
+    for _ in range(300):
+        veredictos = rng.random(rng.integers(1, 200)) < rng.uniform(0.5, 1.0)
+        assert resolver_postura(veredictos, necesarios) == _resolver_con_motor(veredictos, segundos, fps)